@@ -823,13 +823,13 @@ func swiftFiles(under path: String) -> [String] {
     return results
 }
 
-func buildOutputJSON(for paths: [String]) -> OutputJSON {
+func buildOutputJSON(for paths: [String], log: (String) -> Void = { print($0) }) -> OutputJSON {
     let projectContext = ProjectContext()
-    print("Pass 1: Pre-scanning files to build context...")
+    log("Pass 1: Pre-scanning files to build context...")
 
     for (index, p) in paths.enumerated() {
         if (index > 0 && index % 100 == 0) || index == paths.count - 1 {
-            print("  Scanning file \(index + 1)/\(paths.count)...")
+            log("  Scanning file \(index + 1)/\(paths.count)...")
         }
         guard let source = try? String(contentsOfFile: p, encoding: .utf8) else { continue }
 
@@ -838,12 +838,12 @@ func buildOutputJSON(for paths: [String]) -> OutputJSON {
         preScanner.walk(tree)
     }
 
-    print("Pass 2: Collecting symbols with context...")
+    log("Pass 2: Collecting symbols with context...")
     var merged = Decisions()
 
     for (index, p) in paths.enumerated() {
         if (index > 0 && index % 100 == 0) || index == paths.count - 1 {
-            print("  Collecting from file \(index + 1)/\(paths.count)...")
+            log("  Collecting from file \(index + 1)/\(paths.count)...")
         }
         guard let source = try? String(contentsOfFile: p, encoding: .utf8) else { continue }
 
@@ -878,10 +878,39 @@ func buildOutputJSON(for paths: [String]) -> OutputJSON {
     )
 }
 
+// MARK: - Batch Mode
+
+// One NDJSON line of --batch output
+struct BatchRecord: Encodable {
+    var file: String
+    var output: OutputJSON
+}
+
+// Reads newline-delimited file paths from stdin, writes one JSON line per file.
+// Each file is analyzed on its own, same as a single-file invocation.
+func runBatchMode() {
+    let encoder = JSONEncoder()
+    while let line = readLine() {
+        let path = line.trimmingCharacters(in: .whitespaces)
+        if path.isEmpty { continue }
+
+        let record = BatchRecord(file: path, output: buildOutputJSON(for: [path], log: { _ in }))
+        let data = try! encoder.encode(record)
+        print(String(data: data, encoding: .utf8)!)
+        fflush(stdout)
+    }
+}
+
 // MARK: - Main
 
+if CommandLine.arguments.count == 2 && CommandLine.arguments[1] == "--batch" {
+    runBatchMode()
+    exit(0)
+}
+
 if CommandLine.arguments.count < 2 {
     fputs("Usage: \(CommandLine.arguments[0]) <path-to-swift-files>\n", stderr)
+    fputs("       \(CommandLine.arguments[0]) --batch < file-list\n", stderr)
     exit(1)
 }
 
@@ -1,5 +1,6 @@
 """core 패키지"""
 from .condition_matcher import ConditionMatcher
 from .rule_engine import RuleEngine, RuleMatch
+from .symbol import Symbol
 
-__all__ = ['ConditionMatcher', 'RuleEngine', 'RuleMatch']
+__all__ = ['ConditionMatcher', 'RuleEngine', 'RuleMatch', 'Symbol']
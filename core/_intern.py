@@ -0,0 +1,54 @@
+"""
+_intern.py
+
+Rule 리터럴과 AST 심볼 필드 문자열을 sys.intern으로 통일
+
+Rule 리터럴과 AST 값이 같은 객체를 가리키면 dict/set 조회에서
+문자열 비교 대신 포인터 비교로 끝난다.
+"""
+
+import sys
+from typing import Any, Dict, Iterable, List
+
+# 값을 intern 할 심볼 필드 (문자열 / 문자열 리스트)
+_SCALAR_FIELDS = ('symbol_name', 'symbol_kind', 'parent_type', 'access_level')
+_LIST_FIELDS = ('attributes', 'inherits', 'modifiers', 'conforms')
+
+
+def intern_value(value: Any) -> Any:
+    """문자열이면 intern, 아니면 그대로"""
+    if value.__class__ is str:
+        return sys.intern(value)
+    return value
+
+
+def intern_all(values: Iterable[Any]) -> List[Any]:
+    """원소별 intern_value"""
+    return [intern_value(v) for v in values]
+
+
+def intern_symbol(symbol: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    AST 심볼 dict의 Rule 매칭 필드를 intern한 얕은 복사본
+    
+    호출 측의 AST 데이터는 바꾸지 않는다.
+    
+    Args:
+        symbol: AST 심볼 데이터
+    
+    Returns:
+        새 dict (매칭 필드 값만 intern된 문자열로 교체)
+    """
+    symbol = dict(symbol)
+    
+    for field in _SCALAR_FIELDS:
+        value = symbol.get(field)
+        if value.__class__ is str:
+            symbol[field] = sys.intern(value)
+    
+    for field in _LIST_FIELDS:
+        values = symbol.get(field)
+        if values.__class__ is list:
+            symbol[field] = intern_all(values)
+    
+    return symbol
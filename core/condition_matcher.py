@@ -4,14 +4,87 @@ condition_matcher.py
 YAML Rule 조건식을 AST 데이터로 엄격하게 평가
 """
 
-from typing import Any, List, Dict
+from functools import partial
+from typing import Any, Callable, List, Dict, Optional, Tuple, Union
+
+from ._intern import intern_all, intern_value
+from .symbol import Symbol
+
+
+# 지원 연산자 (검사 순서 = 우선순위)
+_OPERATORS = ('contains_any', ' in ', ' == ', ' != ')
+
+# 조건식 필드명 → AST 심볼 키
+_FIELD_MAPPING = {
+    'name': 'symbol_name',
+    'kind': 'symbol_kind',
+    'typeInheritanceChain': 'inherits',
+    'attributes': 'attributes',
+    'modifiers': 'modifiers',
+    'conforms': 'conforms',
+    'accessLevel': 'access_level',
+}
+
+# 좌변 표현식 → AST 심볼 키 (예: 'M.name' → 'symbol_name', 'P.parent.name' → 'parent_type')
+_FIELD_TABLE = {
+    f'{target}.{field}': key
+    for target in ('S', 'M', 'P', 'C', 'E')
+    for field, key in [*_FIELD_MAPPING.items(), ('parent.name', 'parent_type')]
+}
+
+# == 우변의 boolean 리터럴 (대소문자 무시)
+_BOOL_LITERALS = {'true': True, 'false': False}
+
+# 리스트 리터럴에서 제거할 문자 (대괄호, 따옴표)
+_LIST_TRANS = str.maketrans('', '', "[]'\"")
+
+
+def _match_contains_any(field_name: str, values: frozenset, symbol: Symbol) -> bool:
+    """컴파일된 contains_any 조건"""
+    field_value = getattr(symbol, field_name)
+    
+    try:
+        if field_value.__class__ is list:
+            # 교집합 존재 여부를 C 레벨에서 한 번에 검사
+            return not values.isdisjoint(field_value)
+        
+        return field_value in values
+    
+    except TypeError:
+        # 해시 불가능한 값 (dict 등)
+        if field_value.__class__ is list:
+            return any(v in field_value for v in values)
+        return False
+
+
+def _match_in(field_name: str, values: frozenset, symbol: Symbol) -> bool:
+    """컴파일된 in 조건"""
+    try:
+        return getattr(symbol, field_name) in values
+    except TypeError:
+        return False
+
+
+def _match_equals(field_name: str, expected_value: Any, symbol: Symbol) -> bool:
+    """컴파일된 == 조건"""
+    return getattr(symbol, field_name) == expected_value
+
+
+def _match_not_equals(field_name: str, expected_value: Any, symbol: Symbol) -> bool:
+    """컴파일된 != 조건"""
+    return getattr(symbol, field_name) != expected_value
+
+
+def _match_never(symbol: Symbol) -> bool:
+    """지원하지 않는 연산자 / 파싱 실패"""
+    return False
 
 
 class ConditionMatcher:
     """조건식 평가기 (엄격한 매칭)"""
     
     @staticmethod
-    def evaluate(condition: str, symbol: Dict[str, Any]) -> bool:
+    def evaluate(condition: str, symbol: Union[Dict[str, Any], Symbol]) -> bool:
         """
         조건식을 평가하여 True/False 반환
         
@@ -24,125 +97,88 @@ class ConditionMatcher:
         
         Args:
             condition: YAML에서 온 조건식 문자열
-            symbol: AST 심볼 데이터
+            symbol: AST 심볼 데이터 (dict 또는 Symbol)
         
         Returns:
             조건 만족 여부
         """
-        condition = condition.strip()
+        if symbol.__class__ is not Symbol:
+            symbol = Symbol.from_dict(symbol)
         
-        # 1. contains_any 연산자
-        if 'contains_any' in condition:
-            return ConditionMatcher._eval_contains_any(condition, symbol)
+        # 파싱/평가 규칙은 compile()과 동일 (매번 컴파일하므로 반복 평가는 compile 사용)
+        return ConditionMatcher.compile(condition)(symbol)
+    
+    @staticmethod
+    def compile(condition: str) -> Callable[[Symbol], bool]:
+        """
+        조건식을 한 번만 파싱하여 심볼 → bool 판정 함수로 변환
         
-        # 2. in 연산자
-        elif ' in ' in condition:
-            return ConditionMatcher._eval_in(condition, symbol)
+        필드명/연산자/우변 값은 컴파일 시점에 고정된다.
+        반환값은 모듈 함수의 partial이므로 pickle 가능.
+        우변 리터럴은 intern하여 AST 값과 포인터 비교가 되도록 한다.
         
-        # 3. == 연산자
-        elif ' == ' in condition:
-            return ConditionMatcher._eval_equals(condition, symbol)
+        Args:
+            condition: YAML에서 온 조건식 문자열
         
-        # 4. != 연산자
-        elif ' != ' in condition:
-            return ConditionMatcher._eval_not_equals(condition, symbol)
+        Returns:
+            Symbol을 받아 조건 만족 여부를 반환하는 함수
+            (dict는 Symbol.from_dict로 변환 후 전달)
+        """
+        parts = ConditionMatcher._split_condition(condition)
         
-        else:
+        if parts is None:
             # 지원하지 않는 연산자
-            return False
+            return _match_never
+        
+        operator, left_part, right_part = parts
+        field_name = intern_value(ConditionMatcher._parse_field(left_part))
+        
+        if operator == 'contains_any':
+            values = frozenset(intern_all(ConditionMatcher._parse_list(right_part)))
+            return partial(_match_contains_any, field_name, values)
+        elif operator == ' in ':
+            values = frozenset(intern_all(ConditionMatcher._parse_list(right_part)))
+            return partial(_match_in, field_name, values)
+        elif operator == ' == ':
+            expected_value = intern_value(ConditionMatcher._parse_scalar(right_part))
+            return partial(_match_equals, field_name, expected_value)
+        else:
+            return partial(_match_not_equals, field_name, intern_value(right_part.strip("'\"")))
     
     @staticmethod
-    def _eval_contains_any(condition: str, symbol: Dict[str, Any]) -> bool:
+    def _split_condition(condition: str) -> Optional[Tuple[str, str, str]]:
         """
-        contains_any 평가
+        조건식을 (연산자, 좌변, 우변)으로 분리
         
-        예: S.attributes contains_any ['@objc', '@objcMembers']
-        → symbol['attributes']에 '@objc' 또는 '@objcMembers' 있는지
-        """
-        try:
-            # 좌변 파싱 (S.attributes 또는 M.typeInheritanceChain 등)
-            left_part = condition.split('contains_any')[0].strip()
-            field_name = ConditionMatcher._parse_field(left_part)
-            
-            # 우변 파싱 (['@objc', '@objcMembers'])
-            right_part = condition.split('contains_any')[1].strip()
-            values = ConditionMatcher._parse_list(right_part)
-            
-            # 실제 값 가져오기
-            field_value = symbol.get(field_name, [])
-            
-            # contains_any 검사
-            if isinstance(field_value, list):
-                return any(v in field_value for v in values)
-            else:
-                return field_value in values
-                
-        except Exception:
-            return False
-    
-    @staticmethod
-    def _eval_in(condition: str, symbol: Dict[str, Any]) -> bool:
-        """
-        in 연산자 평가
+        연산자 위치를 str.find로 한 번만 찾아 슬라이싱한다 (split 리스트 할당 없음).
+        연산자는 _OPERATORS 순서대로 검사한다.
         
-        예: M.name in ['viewDidLoad', 'viewWillAppear']
-        → symbol['symbol_name']이 리스트에 있는지
+        "S.attributes contains_any ['@objc']" → ('contains_any', 'S.attributes', "['@objc']")
         """
-        try:
-            # 좌변 파싱
-            left_part = condition.split(' in ')[0].strip()
-            field_name = ConditionMatcher._parse_field(left_part)
-            
-            # 우변 파싱
-            right_part = condition.split(' in ')[1].strip()
-            values = ConditionMatcher._parse_list(right_part)
-            
-            # 실제 값
-            field_value = symbol.get(field_name)
-            
-            return field_value in values
-            
-        except Exception:
-            return False
+        condition = condition.strip()
+        
+        for operator in _OPERATORS:
+            idx = condition.find(operator)
+            if idx >= 0:
+                return (
+                    operator,
+                    condition[:idx].strip(),
+                    condition[idx + len(operator):].strip()
+                )
+        
+        return None
     
     @staticmethod
-    def _eval_equals(condition: str, symbol: Dict[str, Any]) -> bool:
+    def _parse_scalar(value_str: str) -> Any:
         """
-        == 연산자 평가
+        == 우변 값 파싱 (따옴표 제거, boolean 처리)
         
-        예: P.kind == 'property'
-        → symbol['symbol_kind'] == 'property'
+        "'property'" → 'property', "true" → True
         """
-        try:
-            parts = condition.split('==')
-            field_name = ConditionMatcher._parse_field(parts[0].strip())
-            expected_value = parts[1].strip().strip("'\"")
-            
-            actual_value = symbol.get(field_name)
-            
-            # boolean 처리
-            if expected_value.lower() in ['true', 'false']:
-                expected_value = expected_value.lower() == 'true'
-            
-            return actual_value == expected_value
-            
-        except Exception:
-            return False
-    
-    @staticmethod
-    def _eval_not_equals(condition: str, symbol: Dict[str, Any]) -> bool:
-        """!= 연산자 평가"""
-        try:
-            parts = condition.split('!=')
-            field_name = ConditionMatcher._parse_field(parts[0].strip())
-            expected_value = parts[1].strip().strip("'\"")
-            
-            actual_value = symbol.get(field_name)
-            
-            return actual_value != expected_value
-            
-        except Exception:
-            return False
+        expected_value = value_str.strip("'\"")
+        
+        # boolean 처리
+        return _BOOL_LITERALS.get(expected_value.lower(), expected_value)
     
     @staticmethod
     def _parse_field(field_expr: str) -> str:
@@ -155,29 +191,23 @@ class ConditionMatcher:
         P.kind → symbol_kind
         M.parent.name → parent_type (특수 케이스)
         """
+        # 자주 쓰이는 표현식은 테이블 조회 한 번으로 처리
+        field = _FIELD_TABLE.get(field_expr)
+        if field is not None:
+            return field
+        
         # 심볼 타입 제거 (S., M., P., C.)
         if '.' in field_expr:
             parts = field_expr.split('.')
             if len(parts) >= 2:
                 field = parts[1]
                 
-                # 필드명 매핑
-                field_mapping = {
-                    'name': 'symbol_name',
-                    'kind': 'symbol_kind',
-                    'typeInheritanceChain': 'inherits',
-                    'attributes': 'attributes',
-                    'modifiers': 'modifiers',
-                    'conforms': 'conforms',
-                    'accessLevel': 'access_level',
-                }
-                
                 # parent.name 같은 중첩 처리
                 if len(parts) >= 3 and parts[1] == 'parent':
                     if parts[2] == 'name':
                         return 'parent_type'
                 
-                return field_mapping.get(field, field)
+                return _FIELD_MAPPING.get(field, field)
         
         return field_expr
     
@@ -188,17 +218,8 @@ class ConditionMatcher:
         
         "['@objc', '@objcMembers']" → ['@objc', '@objcMembers']
         """
-        list_str = list_str.strip()
-        
-        # 대괄호 제거
-        if list_str.startswith('[') and list_str.endswith(']'):
-            list_str = list_str[1:-1]
-        
-        # 쉼표로 분리
-        items = []
-        for item in list_str.split(','):
-            item = item.strip().strip("'\"")
-            if item:
-                items.append(item)
-        
-        return items
+        # 대괄호/따옴표를 한 번에 제거한 뒤 쉼표로 분리
+        return [
+            item for part in list_str.translate(_LIST_TRANS).split(',')
+            if (item := part.strip())
+        ]
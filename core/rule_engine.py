@@ -4,15 +4,52 @@ rule_engine.py
 엄격한 Rule 평가 엔진
 """
 
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
 import yaml
+from functools import partial
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 
-from .condition_matcher import ConditionMatcher
+from .condition_matcher import (
+    ConditionMatcher,
+    _match_contains_any,
+    _match_in,
+    _match_equals,
+)
+from .symbol import Symbol
 
+# libyaml이 있으면 C 로더 사용 (순수 Python SafeLoader보다 수 배 빠름)
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
-@dataclass
+
+# 컴파일 결과 형식이 바뀌면 증가 (기존 캐시 무효화)
+_CACHE_VERSION = 4
+
+# 컴파일된 Rule 캐시 디렉토리 (XDG_CACHE_HOME 우선)
+_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'ai_rule'
+
+
+# find.target → 허용되는 symbol_kind (S / target 없음은 모든 심볼)
+_TARGET_KINDS = {
+    'M': frozenset(['method', 'initializer', 'deinitializer']),
+    'P': frozenset(['property', 'variable']),
+    'C': frozenset(['class', 'struct']),
+    'E': frozenset(['enum']),
+}
+
+# 트리거 인덱스에 쓸 수 있는 조건 (필드 값이 우변 리터럴 중 하나와 같아야 참)
+_INDEXABLE = (_match_contains_any, _match_in, _match_equals)
+
+
+@dataclass(slots=True)
 class RuleMatch:
     """Rule 매칭 결과"""
     rule_id: str
@@ -29,31 +66,354 @@ class RuleEngine:
         """
         Args:
             rules_yaml_path: YAML Rule 파일 경로
+        
+        컴파일 결과는 ~/.cache/ai_rule/<blake2b>.pkl에 캐시하므로
+        YAML 디렉토리가 읽기 전용이거나 mtime이 바뀌어도(체크아웃 등)
+        내용이 같으면 재컴파일하지 않는다.
+        """
+        data = Path(rules_yaml_path).read_bytes()
+        cache_path = self._content_cache_path(data)
+        cache_key = (_CACHE_VERSION,)
+        
+        compiled = self._load_cache(cache_path, cache_key)
+        if compiled is None:
+            compiled = self._compile(data.decode('utf-8'))
+            self._save_cache(cache_path, cache_key, compiled)
+        else:
+            compiled = self._reintern(compiled)
+        
+        self._install(compiled)
+    
+    @classmethod
+    def from_yaml(cls, rules_yaml_path: Path) -> 'RuleEngine':
+        """RuleEngine(rules_yaml_path)와 동일 (내용 해시 캐시 사용)"""
+        return cls(rules_yaml_path)
+    
+    @staticmethod
+    def content_cache_path(rules_yaml_path: Path) -> Path:
+        """컴파일된 Rule 캐시 파일 경로 (YAML 내용 해시 기준)"""
+        return RuleEngine._content_cache_path(Path(rules_yaml_path).read_bytes())
+    
+    @staticmethod
+    def _content_cache_path(data: bytes) -> Path:
+        """YAML 내용 → 사용자 캐시 디렉토리의 캐시 파일 경로"""
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        return _CACHE_DIR / f'{digest}.pkl'
+    
+    @staticmethod
+    def _load_cache(cache_path: Path, cache_key: tuple) -> Optional[tuple]:
+        """
+        유효한 캐시가 있으면 _compile()과 같은 튜플 반환
+        
+        캐시가 없거나 키(형식 버전 등)가 다르거나 읽기에 실패하면 None
+        """
+        try:
+            with open(cache_path, 'rb') as f:
+                if pickle.load(f) != cache_key:
+                    return None
+                return pickle.load(f)
+        except Exception:
+            return None
+    
+    @staticmethod
+    def _save_cache(cache_path: Path, cache_key: tuple, compiled: tuple) -> None:
+        """컴파일된 Rule을 캐시에 원자적으로 저장 (실패해도 무시)"""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(cache_key, f, pickle.HIGHEST_PROTOCOL)
+                    pickle.dump(compiled, f, pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception:
+            # 읽기 전용 디렉토리 등: 캐시 없이 동작
+            pass
+    
+    @classmethod
+    def _compile(cls, yaml_text: str) -> tuple:
+        """
+        YAML 파싱 + 조건식 컴파일 + kind 테이블 구성
+        
+        Returns:
+            (rules, _by_kind, _universal, _index_by_kind, _universal_index)
+        """
+        data = yaml.load(yaml_text, Loader=_YamlLoader)
+        rules = data.get('rules', [])
+        
+        # 조건식은 로드 시 한 번만 컴파일
+        for rule in rules:
+            cls._compile_rule(rule)
+        
+        return (rules, *cls._build_dispatch(rules))
+    
+    @staticmethod
+    def _reintern(compiled: tuple) -> tuple:
+        """
+        캐시에서 읽은 Rule의 필드명/리터럴을 intern (캐시된 테이블은 그대로 사용)
+        
+        unpickle된 문자열은 intern되지 않지만, 같은 리터럴은 pickle memo 덕분에
+        판정 함수/트리거/인덱스에서 한 객체를 공유한다. 그래서 sys.intern은 대부분
+        그 객체를 그대로 등록하고, 같은 값이 이미 intern되어 있던 문자열(필드명 등)만
+        다른 객체를 돌려준다. 그런 문자열이 들어간 곳만 교체한다.
+        
+        Returns:
+            _compile()과 같은 튜플
+        """
+        rules, _, _, index_by_kind, universal_index = compiled
+        
+        # 이미 intern된 다른 객체가 있는 문자열 → 그 객체
+        swap = {}
+        for rule in rules:
+            for predicate in rule['_predicates']:
+                for arg in getattr(predicate, 'args', ()):
+                    for value in (arg if arg.__class__ is frozenset else (arg,)):
+                        if value.__class__ is str and sys.intern(value) is not value:
+                            swap[value] = sys.intern(value)
+        
+        if not swap:
+            return compiled
+        
+        def canonical(arg):
+            """판정 함수 인자 / 트리거 값의 교체본 (교체할 문자열이 없으면 그대로)"""
+            if arg.__class__ is frozenset:
+                if swap.keys().isdisjoint(arg):
+                    return arg
+                return frozenset(swap.get(v, v) for v in arg)
+            return swap.get(arg, arg) if arg.__class__ is str else arg
+        
+        for rule in rules:
+            rule['_compiled_where'] = [
+                (condition, partial(predicate.func, *map(canonical, predicate.args))
+                 if predicate.__class__ is partial else predicate)
+                for condition, predicate in rule['_compiled_where']
+            ]
+            rule['_predicates'] = tuple(predicate for _, predicate in rule['_compiled_where'])
+            
+            if rule['_trigger'] is not None:
+                rule['_trigger'] = tuple(map(canonical, rule['_trigger']))
+        
+        for _, _, triggers in (universal_index, *index_by_kind.values()):
+            for i, (field, postings) in enumerate(triggers):
+                for value in swap.keys() & postings.keys():
+                    postings[swap[value]] = postings.pop(value)
+                triggers[i] = (canonical(field), postings)
+        
+        return compiled
+    
+    def _install(self, compiled: tuple) -> None:
+        """컴파일 결과 (또는 캐시에서 읽은 것) 적용"""
+        (self.rules, self._by_kind, self._universal,
+         self._index_by_kind, self._universal_index) = compiled
+    
+    @classmethod
+    def _compile_rule(cls, rule: Dict) -> None:
+        """
+        Rule의 find/where 단계를 미리 해석하여 rule dict에 저장
+        
+        - _target_type: find.target 값
+        - _target_kinds: 허용 symbol_kind 집합 (None이면 모든 심볼)
+        - _compiled_where: [(조건식 문자열, 판정 함수), ...]
+        - _predicates: 판정 함수 튜플 (평가 루프용)
+        - _match_info: (id, description, 조건식 튜플) - 매칭 성공 시 결과 생성용
+        - _trigger: (필드, 리터럴 집합) - 매칭되려면 필드 값이 반드시 포함해야 하는
+          리터럴 (트리거 인덱스용, 없으면 None)
+        """
+        pattern = rule.get('pattern', [])
+        target_type = cls._get_target_type(pattern)
+        
+        rule['_target_type'] = target_type
+        rule['_target_kinds'] = cls._get_target_kinds(target_type)
+        rule['_compiled_where'] = [
+            (condition, ConditionMatcher.compile(condition))
+            for condition in cls._get_conditions(pattern)
+        ]
+        rule['_predicates'] = tuple(predicate for _, predicate in rule['_compiled_where'])
+        rule['_match_info'] = (
+            rule.get('id', 'UNKNOWN'),
+            rule.get('description', ''),
+            tuple(condition for condition, _ in rule['_compiled_where'])
+        )
+        rule['_trigger'] = cls._select_trigger(rule['_predicates'])
+    
+    @staticmethod
+    def _select_trigger(predicates: tuple) -> Optional[tuple]:
+        """
+        Rule의 AND 조건 중 인덱스 키로 쓸 조건 하나 선택
+        
+        contains_any / in / == 조건은 필드 값(리스트면 원소)이 우변 리터럴 중
+        하나와 같아야 참이므로, 그 리터럴이 없는 심볼은 평가할 필요가 없다.
+        symbol_kind는 kind 테이블과 겹치므로 다른 필드를 우선하고,
+        그다음 리터럴이 적은 조건을 고른다.
+        
+        Returns:
+            (필드, 리터럴 frozenset) 또는 None (항상 평가)
         """
-        with open(rules_yaml_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-            self.rules = data.get('rules', [])
+        best = None
+        best_rank = None
+        
+        for predicate in predicates:
+            if getattr(predicate, 'func', None) not in _INDEXABLE:
+                continue
+            
+            field, values = predicate.args
+            if predicate.func is _match_equals:
+                values = (values,)
+            
+            try:
+                literals = frozenset(values)
+            except TypeError:
+                continue
+            
+            rank = (field == 'symbol_kind', len(literals))
+            if best_rank is None or rank < best_rank:
+                best, best_rank = (field, literals), rank
+        
+        return best
+    
+    @classmethod
+    def _build_dispatch(cls, rules: List[Dict]) -> tuple:
+        """
+        symbol_kind → 후보 Rule 리스트 테이블 구성
+        
+        각 버킷은 해당 kind를 target으로 하는 Rule과 모든 심볼 대상(S) Rule을
+        원래 YAML 순서대로 담는다. 테이블에 없는 kind는 _universal만 평가.
+        버킷마다 트리거 인덱스(_build_index)도 함께 만든다.
+        
+        Returns:
+            (_by_kind, _universal, _index_by_kind, _universal_index)
+        """
+        universal = [r for r in rules if r['_target_kinds'] is None]
+        by_kind: Dict[str, List[Dict]] = {}
+        
+        for kinds in _TARGET_KINDS.values():
+            for kind in kinds:
+                by_kind[kind] = [
+                    r for r in rules
+                    if r['_target_kinds'] is None or kind in r['_target_kinds']
+                ]
+        
+        index_by_kind = {kind: cls._build_index(bucket) for kind, bucket in by_kind.items()}
+        
+        return by_kind, universal, index_by_kind, cls._build_index(universal)
     
-    def match_symbol(self, symbol: Dict[str, Any]) -> List[RuleMatch]:
+    @staticmethod
+    def _build_index(bucket: List[Dict]) -> tuple:
+        """
+        버킷 하나의 역색인: (필드, 리터럴) → 버킷 내 Rule 위치
+        
+        Returns:
+            (bucket, 항상 평가할 위치 튜플, [(필드, {리터럴: 위치 튜플}), ...])
+        """
+        always = []
+        by_field: Dict[str, Dict[Any, list]] = {}
+        
+        for position, rule in enumerate(bucket):
+            trigger = rule['_trigger']
+            if trigger is None:
+                always.append(position)
+                continue
+            
+            field, literals = trigger
+            postings = by_field.setdefault(field, {})
+            for literal in literals:
+                postings.setdefault(literal, []).append(position)
+        
+        triggers = [
+            (field, {literal: tuple(positions) for literal, positions in postings.items()})
+            for field, postings in by_field.items()
+        ]
+        
+        return bucket, tuple(always), triggers
+    
+    def match_symbol(self, symbol: Union[Dict[str, Any], Symbol]) -> List[RuleMatch]:
         """
         심볼에 대해 매칭되는 모든 Rule 찾기
         
         Args:
-            symbol: AST 심볼 데이터
+            symbol: AST 심볼 데이터 (dict 또는 Symbol)
         
         Returns:
             매칭된 Rule 리스트
         """
-        matches = []
+        # 조건 평가는 슬롯 객체의 속성 접근으로 수행 (dict 조회 반복 방지)
+        if symbol.__class__ is not Symbol:
+            symbol = Symbol.from_dict(symbol)
         
-        for rule in self.rules:
-            match_result = self._evaluate_rule(rule, symbol)
-            if match_result.matched:
-                matches.append(match_result)
+        bucket, positions = self._candidates(symbol)
+        evaluate = self._evaluate_rule
+        
+        return [
+            match for position in positions
+            if (match := evaluate(bucket[position], symbol))
+        ]
+    
+    def any_match(self, symbol: Union[Dict[str, Any], Symbol]) -> Optional[RuleMatch]:
+        """
+        처음 매칭되는 Rule 하나만 찾기 (제외 여부만 필요할 때)
         
-        return matches
+        match_symbol(symbol)[0]과 같지만 첫 매칭에서 평가를 멈춘다.
+        
+        Args:
+            symbol: AST 심볼 데이터 (dict 또는 Symbol)
+        
+        Returns:
+            YAML 순서상 첫 번째로 매칭된 Rule (없으면 None)
+        """
+        if symbol.__class__ is not Symbol:
+            symbol = Symbol.from_dict(symbol)
+        
+        bucket, positions = self._candidates(symbol)
+        
+        for position in positions:
+            match = self._evaluate_rule(bucket[position], symbol)
+            if match is not None:
+                return match
+        
+        return None
     
-    def _evaluate_rule(self, rule: Dict, symbol: Dict[str, Any]) -> RuleMatch:
+    def _candidates(self, symbol: Symbol) -> Tuple[List[Dict], List[int]]:
+        """
+        트리거 인덱스로 평가할 Rule 후보 찾기
+        
+        Returns:
+            (kind별 Rule 버킷, 평가할 위치 - YAML 순서로 정렬됨)
+        """
+        try:
+            bucket, always, triggers = self._index_by_kind.get(
+                symbol.symbol_kind, self._universal_index
+            )
+        except TypeError:
+            # 해시 불가능한 symbol_kind
+            bucket, always, triggers = self._universal_index
+        
+        # 심볼 필드 값으로 인덱스 조회 → 평가할 Rule 위치 (YAML 순서 유지를 위해 정렬)
+        positions = set(always)
+        
+        for field, postings in triggers:
+            value = getattr(symbol, field)
+            
+            try:
+                if value.__class__ is list:
+                    for item in value:
+                        hit = postings.get(item)
+                        if hit:
+                            positions.update(hit)
+                else:
+                    hit = postings.get(value)
+                    if hit:
+                        positions.update(hit)
+            except TypeError:
+                # 해시 불가능한 값: 해당 필드의 트리거는 모두 후보로
+                for hit in postings.values():
+                    positions.update(hit)
+        
+        return bucket, sorted(positions)
+    
+    def _evaluate_rule(self, rule: Dict, symbol: Symbol) -> Optional[RuleMatch]:
         """
         단일 Rule 평가
         
@@ -67,49 +427,34 @@ class RuleEngine:
             - where:
               - S.attributes contains_any ['@objc']
         ```
+        
+        Returns:
+            모든 조건을 만족하면 RuleMatch, 아니면 None
+            (대부분을 차지하는 불일치 경우에는 객체를 만들지 않음)
         """
-        rule_id = rule.get('id', 'UNKNOWN')
-        rule_desc = rule.get('description', '')
-        pattern = rule.get('pattern', [])
+        # find 단계 (심볼 타입 확인)는 match_symbol의 kind 테이블에서 처리됨
         
-        # 1. find 단계 (심볼 타입 확인)
-        target_type = self._get_target_type(pattern)
-        if not self._matches_symbol_type(symbol, target_type):
-            return RuleMatch(
-                rule_id=rule_id,
-                rule_description=rule_desc,
-                matched=False,
-                confidence=0.0,
-                conditions_met=[]
-            )
+        # where 단계 (조건 평가): 하나라도 실패하면 전체 실패 (AND 로직)
+        for predicate in rule['_predicates']:
+            if not predicate(symbol):
+                return None
         
-        # 2. where 단계 (조건 평가)
-        conditions = self._get_conditions(pattern)
-        conditions_met = []
-        
-        for condition in conditions:
-            if ConditionMatcher.evaluate(condition, symbol):
-                conditions_met.append(condition)
-            else:
-                # 하나라도 실패하면 전체 실패 (AND 로직)
-                return RuleMatch(
-                    rule_id=rule_id,
-                    rule_description=rule_desc,
-                    matched=False,
-                    confidence=0.0,
-                    conditions_met=conditions_met
-                )
-        
-        # 모든 조건 통과
+        return self._make_match(rule)
+    
+    @staticmethod
+    def _make_match(rule: Dict) -> RuleMatch:
+        """모든 조건을 만족한 Rule의 매칭 결과"""
+        rule_id, rule_desc, conditions = rule['_match_info']
         return RuleMatch(
             rule_id=rule_id,
             rule_description=rule_desc,
             matched=True,
             confidence=1.0,  # 엄격한 매칭이므로 항상 1.0
-            conditions_met=conditions_met
+            conditions_met=list(conditions)
         )
     
-    def _get_target_type(self, pattern: List[Dict]) -> Optional[str]:
+    @staticmethod
+    def _get_target_type(pattern: List[Dict]) -> Optional[str]:
         """
         find 단계에서 target 추출
         
@@ -123,36 +468,26 @@ class RuleEngine:
                 return step['find'].get('target')
         return None
     
-    def _matches_symbol_type(self, symbol: Dict[str, Any], target: Optional[str]) -> bool:
+    @staticmethod
+    def _get_target_kinds(target: Optional[str]) -> Optional[frozenset]:
         """
-        심볼 타입이 target과 매칭되는지 확인
+        target에 매칭되는 symbol_kind 집합
         
         target 매핑:
-        - S: 모든 심볼
+        - S: 모든 심볼 (None)
         - M: method
         - P: property
         - C: class, struct
         - E: enum
+        - 그 외: 매칭 없음 (빈 집합)
         """
-        if not target:
-            return True  # target 없으면 모든 심볼 매칭
-        
-        symbol_kind = symbol.get('symbol_kind', '')
-        
-        if target == 'S':
-            return True  # 모든 심볼
-        elif target == 'M':
-            return symbol_kind in ['method', 'initializer', 'deinitializer']
-        elif target == 'P':
-            return symbol_kind in ['property', 'variable']
-        elif target == 'C':
-            return symbol_kind in ['class', 'struct']
-        elif target == 'E':
-            return symbol_kind == 'enum'
-        else:
-            return False
+        if not target or target == 'S':
+            return None  # target 없으면 모든 심볼 매칭
+        
+        return _TARGET_KINDS.get(target, frozenset())
     
-    def _get_conditions(self, pattern: List[Dict]) -> List[str]:
+    @staticmethod
+    def _get_conditions(pattern: List[Dict]) -> List[str]:
         """
         where 단계에서 조건 리스트 추출
         
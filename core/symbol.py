@@ -0,0 +1,61 @@
+"""
+symbol.py
+
+Rule 매칭용 경량 심볼 객체
+"""
+
+from typing import Any, Dict
+
+
+class Symbol:
+    """
+    AST 심볼 dict를 고정 슬롯 객체로 변환한 것
+    
+    Rule 조건에서 쓰이는 필드는 __slots__ 속성으로 한 번만 꺼내 두고,
+    그 외 필드는 원본 dict에서 조회한다.
+    없는 필드는 None.
+    """
+    
+    __slots__ = (
+        'attributes',
+        'symbol_name',
+        'symbol_kind',
+        'inherits',
+        'modifiers',
+        'conforms',
+        'access_level',
+        'parent_type',
+        'parent',
+        'isReferencedByExternalFile',
+        'isSystemSymbol',
+        '_data',
+    )
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Symbol':
+        """
+        AST 심볼 dict → Symbol
+        
+        Args:
+            data: AST 심볼 데이터
+        """
+        symbol = cls.__new__(cls)
+        symbol.attributes = data.get('attributes')
+        symbol.symbol_name = data.get('symbol_name')
+        symbol.symbol_kind = data.get('symbol_kind')
+        symbol.inherits = data.get('inherits')
+        symbol.modifiers = data.get('modifiers')
+        symbol.conforms = data.get('conforms')
+        symbol.access_level = data.get('access_level')
+        symbol.parent_type = data.get('parent_type')
+        symbol.parent = data.get('parent')
+        symbol.isReferencedByExternalFile = data.get('isReferencedByExternalFile')
+        symbol.isSystemSymbol = data.get('isSystemSymbol')
+        symbol._data = data
+        return symbol
+    
+    def __getattr__(self, name: str) -> Any:
+        """슬롯에 없는 필드는 원본 dict에서 조회 (_data와 dunder 이름은 제외)"""
+        if name == '_data' or (name.startswith('__') and name.endswith('__')):
+            raise AttributeError(name)
+        return self._data.get(name)
@@ -6,14 +6,79 @@ main.py
 
 import json
 import argparse
+import mmap
+import os
+import re
 import subprocess
+import threading
 import time
+from contextlib import nullcontext
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Optional
+from concurrent.futures import as_completed
+from typing import Any, Collection, Iterator, List, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json 사용
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:  # 선택 의존성: 없으면 정규식으로 검사
+    ahocorasick = None
 
 from config.settings import *
-from verifiers import StrictVerifier
+from verifiers import StrictVerifier, VerificationResult
+from verifiers.pool import create_pool, worker_verifier
+from verifiers.strict_verifier import ndjson_line
+
+
+def _json_loads(data) -> Any:
+    """JSON 파싱 (orjson 우선, str/bytes/memoryview 모두 허용)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _json_dump(obj: Any, output_path: Path):
+    """JSON 파일 저장 (들여쓰기 2, UTF-8 그대로)"""
+    if orjson is not None:
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+
+def _iter_swift(root: Path) -> Iterator[Path]:
+    """
+    프로젝트 아래 Swift 파일을 찾는 대로 하나씩 내보내기 (os.scandir, 순서 무관)
+    
+    디렉터리 심볼릭 링크는 따라가지 않고, 읽을 수 없는 디렉터리는 건너뛴다 (rglob과 동일).
+    
+    Args:
+        root: 프로젝트 루트 경로
+    
+    Yields:
+        Swift 파일 경로
+    """
+    stack = [os.fspath(root)]
+    
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except PermissionError:
+            continue
+        
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.swift') and entry.is_file():
+                    yield Path(entry.path)
 
 
 def find_swift_files(project_path: Path) -> List[Path]:
@@ -24,9 +89,83 @@ def find_swift_files(project_path: Path) -> List[Path]:
         project_path: 프로젝트 루트 경로
     
     Returns:
-        Swift 파일 경로 리스트
+        Swift 파일 경로 리스트 (정렬됨)
     """
-    return sorted(project_path.rglob("*.swift"))
+    return sorted(_iter_swift(project_path))
+
+
+# 합성된 심볼 이름에서 앞쪽 이름 토큰을 자르는 위치 (시그니처 / 제네릭 절 시작)
+_NAME_CUT = re.compile(r'[(<]')
+
+
+class IdentifierScanner:
+    """LLM 예측 식별자가 소스 파일에 한 번이라도 등장하는지 빠르게 검사"""
+    
+    def __init__(self, identifiers: Collection[str]):
+        """
+        Args:
+            identifiers: LLM 예측 식별자
+        
+        pyahocorasick가 있으면 Aho-Corasick 오토마톤, 없으면 정규식 alternation 사용
+        
+        analyzer는 이니셜라이저/서브스크립트 이름을 시그니처로 합성하므로
+        (init(coder: NSCoder), subscript(i: Int)-> Int) 식별자 전체가 아니라
+        앞쪽 이름 토큰(init, subscript)으로 검사한다. 과다 매칭은 AST 추출을
+        한 번 더 할 뿐이지만, 누락은 식별자를 환각으로 잘못 보고하게 된다.
+        """
+        words = {
+            _NAME_CUT.split(identifier, 1)[0].strip()
+            for identifier in identifiers if identifier
+        }
+        self._automaton = None
+        self._pattern = None
+        self._always = False
+        
+        if not words:
+            return
+        
+        if '' in words:
+            # 이름 토큰이 없는 식별자 ('(...)' 등): 걸러낼 수 없으므로 모든 파일 검사
+            self._always = True
+            return
+        
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for word in words:
+                self._automaton.add_word(word, word)
+            self._automaton.make_automaton()
+        else:
+            self._pattern = re.compile(b'|'.join(re.escape(w.encode('utf-8')) for w in words))
+    
+    def mentions_any(self, swift_file: Path) -> bool:
+        """
+        파일에 식별자가 하나라도 있는지 확인
+        
+        식별자의 이름 토큰이 소스에 없으면 AST에도 없으므로 AST 추출을 생략할 수 있다.
+        파일을 읽을 수 없으면 판단하지 않고 True (정상 경로에서 처리)
+        """
+        if self._always:
+            return True
+        
+        if self._automaton is None and self._pattern is None:
+            return False
+        
+        try:
+            with open(swift_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return False
+                
+                # 오토마톤은 str이 필요하므로 그대로 읽어 디코드
+                if self._automaton is not None:
+                    text = f.read().decode('utf-8', errors='ignore')
+                    return next(self._automaton.iter(text), None) is not None
+                
+                # 정규식은 bytes를 복사 없이 mmap에서 바로 검색
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    return self._pattern.search(buf) is not None
+        
+        except OSError:
+            return True
 
 
 def extract_ast(swift_file: Path, analyzer_path: Path) -> Optional[Dict]:
@@ -41,48 +180,149 @@ def extract_ast(swift_file: Path, analyzer_path: Path) -> Optional[Dict]:
         AST 데이터 또는 None
     """
     try:
+        # stdout은 bytes 그대로 받는다 (UTF-8 디코드 + str 복사 생략)
+        # POSIX에서 close_fds=False이면 fork 대신 posix_spawn 경로 사용
         result = subprocess.run(
             [str(analyzer_path), str(swift_file)],
             capture_output=True,
-            text=True,
             timeout=30,
-            encoding='utf-8'
+            close_fds=(os.name == 'nt')
         )
         
         if result.returncode != 0:
             return None
         
-        output = result.stdout.strip()
+        output = result.stdout
         
-        # JSON 파싱
-        start_idx = output.find('{')
+        # JSON 파싱 (앞쪽 로그 줄은 건너뜀)
+        start_idx = output.find(b'{')
         if start_idx == -1:
             return None
         
-        json_str = output[start_idx:]
-        ast_data = json.loads(json_str)
-        
-        # SwiftASTAnalyzer 출력 구조 처리
-        if isinstance(ast_data, dict) and "decisions" in ast_data:
-            # decisions를 symbols로 변환
-            decisions = ast_data["decisions"]
-            symbols = []
+        return normalize_ast(_json_loads(memoryview(output)[start_idx:]))
+    
+    except Exception as e:
+        print(f"  ⚠️  AST 추출 실패: {swift_file.name} - {e}")
+        return None
+
+
+def batch_extract_ast(
+    swift_files: List[Path],
+    analyzer_path: Path,
+    timeout_per_file: float = 30
+) -> Optional[Dict[Path, Dict]]:
+    """
+    SwiftASTAnalyzer --batch 모드로 모든 파일의 AST를 한 번에 추출
+    
+    stdin으로 파일 경로를 한 줄씩 넘기고, stdout에서 파일당 한 줄의
+    JSON({"file": ..., "output": ...})을 bytes 그대로 도착하는 대로 읽는다.
+    프로세스 기동 비용을 파일 수만큼이 아니라 한 번만 지불한다.
+    
+    Args:
+        swift_files: Swift 파일 경로 리스트
+        analyzer_path: SwiftASTAnalyzer 실행 파일 경로
+        timeout_per_file: 파일당 제한 시간(초), 전체 제한은 파일 수만큼 곱한 값
+    
+    Returns:
+        {파일 경로: AST 데이터} 딕셔너리 또는 None (--batch 미지원/실패/시간 초과)
+    """
+    if not swift_files:
+        return {}
+    
+    timeout = timeout_per_file * len(swift_files)
+    
+    try:
+        # stdout은 bytes로 한 줄씩 읽는다 (전체 출력을 str로 모아 두지 않음)
+        with subprocess.Popen(
+            [str(analyzer_path), '--batch'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            close_fds=(os.name == 'nt')
+        ) as proc:
+            # 경로 쓰기는 별도 스레드에서 (stdout을 읽는 동안 파이프가 막히지 않도록)
+            writer = threading.Thread(
+                target=_write_paths,
+                args=(proc.stdin, swift_files),
+                daemon=True
+            )
+            writer.start()
+            
+            timed_out = threading.Event()
+            watchdog = threading.Timer(timeout, lambda: (timed_out.set(), proc.kill()))
+            watchdog.start()
+            
+            files_by_path = {str(f): f for f in swift_files}
+            asts = {}
             
-            for category in ["classes", "structs", "enums", "protocols",
-                            "methods", "properties", "variables", "enumCases",
-                            "initializers", "deinitializers", "subscripts", "extensions"]:
-                if category in decisions and isinstance(decisions[category], list):
-                    symbols.extend(decisions[category])
+            try:
+                for line in proc.stdout:
+                    # 진행 로그 등 JSON이 아닌 줄은 무시
+                    if not line.startswith(b'{'):
+                        continue
+                    
+                    record = _json_loads(line)
+                    swift_file = files_by_path.get(record.get("file"))
+                    if swift_file is not None:
+                        asts[swift_file] = normalize_ast(record.get("output"))
+                
+                returncode = proc.wait()
             
-            return {"symbols": symbols}
+            except BaseException:
+                proc.kill()
+                raise
+            
+            finally:
+                watchdog.cancel()
+                writer.join()
+        
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(proc.args, timeout)
         
-        return ast_data
+        if returncode != 0:
+            return None
         
+        # 구버전 analyzer는 --batch를 경로로 해석하여 레코드를 내지 않음
+        return asts or None
+    
     except Exception as e:
-        print(f"  ⚠️  AST 추출 실패: {swift_file.name} - {e}")
+        print(f"  ⚠️  배치 AST 추출 실패: {e}")
         return None
 
 
+def _write_paths(stdin, swift_files: List[Path]):
+    """analyzer stdin에 파일 경로를 한 줄씩 쓰고 닫기 (analyzer가 먼저 끝나면 무시)"""
+    try:
+        with stdin:
+            for swift_file in swift_files:
+                stdin.write(os.fsencode(swift_file) + b"\n")
+    except OSError:
+        # BrokenPipeError 등: 결과는 stdout/종료 코드로 판단
+        pass
+
+
+def normalize_ast(ast_data: Dict) -> Dict:
+    """
+    SwiftASTAnalyzer 출력 구조 처리
+    
+    {"decisions": {"classes": [...], ...}} → {"symbols": [...]}
+    """
+    if isinstance(ast_data, dict) and "decisions" in ast_data:
+        # decisions를 symbols로 변환
+        decisions = ast_data["decisions"]
+        symbols = []
+        
+        for category in ["classes", "structs", "enums", "protocols",
+                        "methods", "properties", "variables", "enumCases",
+                        "initializers", "deinitializers", "subscripts", "extensions"]:
+            if category in decisions and isinstance(decisions[category], list):
+                symbols.extend(decisions[category])
+        
+        return {"symbols": symbols}
+    
+    return ast_data
+
+
 def load_llm_identifiers(identifiers_json_path: Path) -> Dict[str, List[str]]:
     """
     LLM 예측 식별자 로드 (파일별)
@@ -93,8 +333,8 @@ def load_llm_identifiers(identifiers_json_path: Path) -> Dict[str, List[str]]:
     Returns:
         {파일명: [식별자...]} 딕셔너리
     """
-    with open(identifiers_json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with open(identifiers_json_path, 'rb') as f:
+        data = _json_loads(f.read())
         
         # 단일 리스트 형식
         if "identifiers" in data and isinstance(data["identifiers"], list):
@@ -108,31 +348,34 @@ def load_llm_identifiers(identifiers_json_path: Path) -> Dict[str, List[str]]:
 def process_single_file(
     swift_file: Path,
     analyzer_path: Path,
-    verifier: StrictVerifier,
-    llm_identifiers: List[str],
+    ast_data: Optional[Dict],
+    llm_identifiers: Collection[str],
     file_index: int,
     total_files: int,
-    min_confidence: float
+    min_confidence: float,
+    all_matches: bool = False
 ) -> Dict:
     """
-    단일 Swift 파일 처리
+    단일 Swift 파일 처리 (워커 프로세스에서 실행)
     
     Args:
         swift_file: Swift 파일 경로
         analyzer_path: SwiftASTAnalyzer 경로
-        verifier: StrictVerifier 인스턴스
+        ast_data: 배치 추출된 AST 데이터 (None이면 파일별로 추출)
         llm_identifiers: LLM 예측 식별자
         file_index: 파일 인덱스
         total_files: 전체 파일 수
         min_confidence: 최소 신뢰도
+        all_matches: True면 심볼마다 매칭되는 Rule을 모두 찾기 (기본: 첫 Rule만)
     
     Returns:
         검증 결과 딕셔너리
     """
     print(f"[{file_index}/{total_files}] 처리 중: {swift_file.name}")
     
-    # AST 추출
-    ast_data = extract_ast(swift_file, analyzer_path)
+    # AST 추출 (배치 추출 결과가 없을 때만)
+    if ast_data is None:
+        ast_data = extract_ast(swift_file, analyzer_path)
     
     if not ast_data:
         print(f"  ⚠️  AST 추출 실패")
@@ -143,10 +386,12 @@ def process_single_file(
         }
     
     # 검증
+    verifier = worker_verifier()
     results = verifier.verify(
         ast_data=ast_data,
         llm_identifiers=llm_identifiers,
-        min_confidence=min_confidence
+        min_confidence=min_confidence,
+        fast=not all_matches
     )
     
     # 최종 제외 식별자
@@ -161,41 +406,56 @@ def process_single_file(
         "total_predictions": len(results),
         "found_in_ast": sum(1 for r in results if r.found_in_ast),
         "rule_matched": sum(1 for r in results if r.rule_matches),
-        "details": [
-            {
-                "identifier": r.identifier,
-                "found_in_ast": r.found_in_ast,
-                "rule_matched": len(r.rule_matches) > 0,
-                "matched_rules": [m.rule_id for m in r.rule_matches],
-                "final_decision": r.final_decision,
-                "confidence": r.confidence,
-                "reasoning": r.reasoning
-            }
-            for r in results
-        ]
+        "details": list(map(VerificationResult.to_dict, results))
     }
 
 
-def print_summary(all_results: List[Dict]):
+def _new_totals() -> Dict[str, int]:
+    """파일별 결과 누적 통계 초기값"""
+    return {
+        "total_files": 0,
+        "success_files": 0,
+        "failed_files": 0,
+        "total_predictions": 0,
+        "found_in_ast": 0,
+        "rule_matched": 0,
+        "final_exclusions": 0,
+    }
+
+
+def _add_to_totals(totals: Dict[str, int], result: Dict):
+    """파일 하나의 결과를 누적 통계에 반영 (결과 리스트를 보관하지 않음)"""
+    totals["total_files"] += 1
+    
+    if not result.get("success", False):
+        totals["failed_files"] += 1
+        return
+    
+    totals["success_files"] += 1
+    totals["total_predictions"] += result.get("total_predictions", 0)
+    totals["found_in_ast"] += result.get("found_in_ast", 0)
+    totals["rule_matched"] += result.get("rule_matched", 0)
+    totals["final_exclusions"] += len(result.get("exclusions", []))
+
+
+def print_summary(totals: Dict[str, int]):
     """전체 결과 요약 출력"""
     print("\n" + "=" * 70)
     print("📊 전체 검증 결과")
     print("=" * 70)
     
-    total_files = len(all_results)
-    success_files = sum(1 for r in all_results if r.get("success", False))
-    failed_files = total_files - success_files
+    success_files = totals["success_files"]
     
-    print(f"\n✓ 총 파일: {total_files}개")
+    print(f"\n✓ 총 파일: {totals['total_files']}개")
     print(f"✓ 성공: {success_files}개")
-    print(f"✓ 실패: {failed_files}개")
+    print(f"✓ 실패: {totals['failed_files']}개")
     
     if success_files > 0:
         # 통계
-        total_predictions = sum(r.get("total_predictions", 0) for r in all_results if r.get("success"))
-        total_found = sum(r.get("found_in_ast", 0) for r in all_results if r.get("success"))
-        total_rule_matched = sum(r.get("rule_matched", 0) for r in all_results if r.get("success"))
-        total_exclusions = sum(len(r.get("exclusions", [])) for r in all_results if r.get("success"))
+        total_predictions = totals["total_predictions"]
+        total_found = totals["found_in_ast"]
+        total_rule_matched = totals["rule_matched"]
+        total_exclusions = totals["final_exclusions"]
         
         print(f"\n📈 전체 통계:")
         print(f"  • 총 LLM 예측: {total_predictions}개")
@@ -208,8 +468,8 @@ def print_summary(all_results: List[Dict]):
         print(f"\n⚠️  환각률: {hallucination}/{total_predictions}개 ({hallucination/total_predictions*100:.1f}%)")
 
 
-def main():
-    """메인 실행"""
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """명령행 인자 파싱"""
     parser = argparse.ArgumentParser(
         description="엄격한 AI-Rule 검증 시스템 - 프로젝트 전체 병렬 처리"
     )
@@ -246,8 +506,8 @@ def main():
     parser.add_argument(
         '--workers',
         type=int,
-        default=5,
-        help='병렬 처리 워커 수 (기본: 5)'
+        default=None,
+        help='병렬 처리 워커 수 (기본: CPU 수, --batch 미지원 시 CPU 수 x 2 / 최소 8)'
     )
     parser.add_argument(
         '--min-confidence',
@@ -255,31 +515,70 @@ def main():
         default=MIN_CONFIDENCE,
         help='최소 신뢰도 (기본: 1.0)'
     )
+    parser.add_argument(
+        '--legacy-json',
+        action='store_true',
+        help='결과를 NDJSON 대신 단일 JSON 객체로 저장 (전체 결과를 메모리에 보관)'
+    )
+    parser.add_argument(
+        '--all-matches',
+        action='store_true',
+        help='심볼마다 매칭되는 Rule을 모두 찾아 기록 (기본: 첫 매칭 Rule에서 중단)'
+    )
+    
+    return parser.parse_args(argv)
+
+
+def run(
+    project: Path,
+    identifiers: Path,
+    output: Optional[Path] = None,
+    workers: Optional[int] = None,
+    analyzer: Path = Path('SwiftASTAnalyzer/.build/release/SwiftASTAnalyzer'),
+    rules: Path = RULES_YAML,
+    min_confidence: float = MIN_CONFIDENCE,
+    legacy_json: bool = False,
+    all_matches: bool = False
+) -> Optional[Dict]:
+    """
+    프로젝트 전체 검증 실행 (CLI 없이 프로세스 내에서 호출 가능)
     
-    args = parser.parse_args()
+    Args:
+        project: Swift 프로젝트 루트 경로
+        identifiers: LLM 예측 식별자 JSON 파일 경로
+        output: 결과 저장 경로 (None이면 RESULTS_DIR 아래 자동 생성)
+        workers: 워커 수 (None이면 자동)
+        analyzer: SwiftASTAnalyzer 실행 파일 경로
+        rules: Rule YAML 파일 경로
+        min_confidence: 최소 신뢰도
+        legacy_json: True면 NDJSON 대신 단일 JSON 객체로 저장
+        all_matches: True면 details에 매칭된 Rule을 모두 기록 (기본: 첫 Rule에서 중단)
     
+    Returns:
+        전체 통계 (NDJSON 푸터와 동일, output_path 포함) 또는 실패 시 None
+    """
     # 경로 확인
-    project_path = Path(args.project)
-    identifiers_path = Path(args.identifiers)
-    analyzer_path = Path(args.analyzer)
-    rules_path = Path(args.rules)
+    project_path = Path(project)
+    identifiers_path = Path(identifiers)
+    analyzer_path = Path(analyzer)
+    rules_path = Path(rules)
     
     if not project_path.exists():
         print(f"❌ 프로젝트 경로 없음: {project_path}")
-        return 1
+        return None
     
     if not identifiers_path.exists():
         print(f"❌ 식별자 파일 없음: {identifiers_path}")
-        return 1
+        return None
     
     if not analyzer_path.exists():
         print(f"❌ SwiftASTAnalyzer 없음: {analyzer_path}")
         print(f"   빌드 필요: cd SwiftASTAnalyzer && swift build -c release")
-        return 1
+        return None
     
     if not rules_path.exists():
         print(f"❌ Rule 파일 없음: {rules_path}")
-        return 1
+        return None
     
     # Swift 파일 찾기
     print("\n🔍 Swift 파일 검색 중...")
@@ -287,7 +586,7 @@ def main():
     
     if not swift_files:
         print(f"❌ Swift 파일 없음: {project_path}")
-        return 1
+        return None
     
     print(f"✓ {len(swift_files)}개 Swift 파일 발견")
     
@@ -300,11 +599,12 @@ def main():
         llm_identifiers = identifiers_data["all"]
         print(f"✓ {len(llm_identifiers)}개 식별자 로드 (전체 공통)")
     else:
-        # 파일별 식별자 (추후 구현)
-        llm_identifiers = []
-        for ids in identifiers_data.values():
-            llm_identifiers.extend(ids)
-        llm_identifiers = list(set(llm_identifiers))
+        # 파일별 식별자 (추후 구현): 중복 제거 후 모든 워커에 공유
+        llm_identifiers = frozenset(
+            identifier
+            for ids in identifiers_data.values()
+            for identifier in ids
+        )
         print(f"✓ {len(llm_identifiers)}개 식별자 로드 (파일별 병합)")
     
     # Verifier 초기화
@@ -314,13 +614,70 @@ def main():
     
     # 병렬 처리
     print("\n" + "=" * 70)
-    print(f"🚀 병렬 처리 시작 (워커: {args.workers}개)")
+    print("🚀 병렬 처리 시작")
     print("=" * 70 + "\n")
     
     start_time = time.time()
+    
+    # 예측 식별자가 전혀 등장하지 않는 파일은 AST 추출 생략
+    scanner = IdentifierScanner(llm_identifiers)
+    target_files = []
+    skipped_files = []
+    for swift_file in swift_files:
+        if scanner.mentions_any(swift_file):
+            target_files.append(swift_file)
+        else:
+            skipped_files.append(swift_file)
+    
+    if skipped_files:
+        print(f"⏭️  식별자 미포함 파일 {len(skipped_files)}개: AST 추출 생략")
+    
+    # AST 일괄 추출 (analyzer 프로세스 1회)
+    print("🧩 AST 일괄 추출 중...")
+    ast_by_file = batch_extract_ast(target_files, analyzer_path)
+    
+    cpu_count = os.cpu_count() or 4
+    
+    if ast_by_file is None:
+        print("  ⚠️  --batch 미지원: 파일별 추출로 진행")
+        ast_by_file = {}
+        # 워커가 analyzer 실행을 기다리는 시간이 대부분 → CPU 수보다 많이
+        if workers is None:
+            workers = max(8, cpu_count * 2)
+    else:
+        print(f"✓ {len(ast_by_file)}개 파일 AST 추출 완료")
+        if workers is None:
+            workers = cpu_count
+    
+    print(f"👷 워커: {workers}개\n")
+    
+    # 생략한 파일은 빈 AST로 검증 (모든 예측이 "Not found in AST")
+    for swift_file in skipped_files:
+        ast_by_file[swift_file] = {"symbols": []}
+    
+    # 결과 저장 경로
+    if output:
+        output_path = Path(output)
+    else:
+        suffix = "json" if legacy_json else "ndjson"
+        output_path = RESULTS_DIR / f"verification_{int(time.time())}.{suffix}"
+    
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    totals = _new_totals()
     all_results = []
     
-    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+    # NDJSON: 헤더 1줄 → 파일별 결과 1줄씩 (도착 순) → 통계 푸터 1줄
+    report_file = nullcontext() if legacy_json else open(output_path, 'wb')
+    
+    with report_file as out, create_pool(workers, rules_path, verifier) as executor:
+        if not legacy_json:
+            out.write(ndjson_line({
+                "project": str(project_path),
+                "workers": workers,
+                "records_follow": True
+            }))
+        
         futures = {}
         
         for i, swift_file in enumerate(swift_files, 1):
@@ -328,52 +685,68 @@ def main():
                 process_single_file,
                 swift_file,
                 analyzer_path,
-                verifier,
+                ast_by_file.get(swift_file),
                 llm_identifiers,
                 i,
                 len(swift_files),
-                args.min_confidence
+                min_confidence,
+                all_matches
             )
             futures[future] = swift_file
         
-        # 결과 수집
+        # 결과 수집 (완료되는 대로 기록)
         for future in as_completed(futures):
             result = future.result()
-            all_results.append(result)
+            _add_to_totals(totals, result)
+            
+            if legacy_json:
+                all_results.append(result)
+            else:
+                out.write(ndjson_line(result))
+        
+        elapsed_time = time.time() - start_time
+        
+        summary = {
+            "project": str(project_path),
+            "total_files": len(swift_files),
+            "success_files": totals["success_files"],
+            "failed_files": totals["failed_files"],
+            "processing_time_seconds": elapsed_time,
+            "files_per_second": len(swift_files) / elapsed_time,
+            "workers": workers,
+        }
+        
+        if legacy_json:
+            summary["results"] = all_results
+        else:
+            summary.update(
+                total_predictions=totals["total_predictions"],
+                found_in_ast=totals["found_in_ast"],
+                rule_matched=totals["rule_matched"],
+                final_exclusions=totals["final_exclusions"],
+                records_follow=False
+            )
+            out.write(ndjson_line(summary))
     
-    elapsed_time = time.time() - start_time
+    if legacy_json:
+        _json_dump(summary, output_path)
     
     # 결과 요약
-    print_summary(all_results)
+    print_summary(totals)
     
     print(f"\n⏱️  처리 시간: {elapsed_time:.2f}초")
     print(f"⚡ 평균 속도: {len(swift_files)/elapsed_time:.2f} files/sec")
     
-    # 결과 저장
-    if args.output:
-        output_path = Path(args.output)
-    else:
-        output_path = RESULTS_DIR / f"verification_{int(time.time())}.json"
-    
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    summary = {
-        "project": str(project_path),
-        "total_files": len(swift_files),
-        "success_files": sum(1 for r in all_results if r.get("success")),
-        "failed_files": sum(1 for r in all_results if not r.get("success")),
-        "processing_time_seconds": elapsed_time,
-        "files_per_second": len(swift_files) / elapsed_time,
-        "workers": args.workers,
-        "results": all_results
-    }
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(summary, f, indent=2, ensure_ascii=False)
-    
     print(f"\n💾 상세 리포트 저장: {output_path}")
     
-    return 0
+    summary["output_path"] = str(output_path)
+    return summary
+
+
+def main():
+    """메인 실행"""
+    args = _parse_args()
+    return 0 if run(**vars(args)) is not None else 1
 
 
 if __name__ == "__main__":
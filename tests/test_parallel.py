@@ -8,16 +8,15 @@ test_parallel.py
 import json
 import sys
 import tempfile
-import shutil
+import time
 from pathlib import Path
 
 # 프로젝트 루트 추가
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 
-def create_test_project():
-    """테스트용 Swift 프로젝트 생성"""
-    temp_dir = Path(tempfile.mkdtemp())
+def create_test_project(temp_dir: Path):
+    """테스트용 Swift 프로젝트 생성 (temp_dir 아래에 Swift 파일 작성)"""
     
     # Swift 파일 1
     file1 = temp_dir / "ViewController.swift"
@@ -78,22 +77,227 @@ def create_test_predictions(temp_dir: Path):
     return pred_file
 
 
+def create_test_asts(temp_dir: Path, count: int):
+    """테스트용 AST JSON 파일 생성 (SwiftASTAnalyzer 없이 검증 가능)"""
+    ast_paths = []
+    
+    for i in range(count):
+        ast_data = {
+            "symbols": [
+                {
+                    "symbol_name": "viewDidLoad",
+                    "symbol_kind": "method",
+                    "attributes": ["@objc", "override"],
+                    "inherits": ["UIViewController"]
+                },
+                {
+                    "symbol_name": f"customMethod{i}",
+                    "symbol_kind": "method",
+                    "attributes": [],
+                    "inherits": []
+                }
+            ]
+        }
+        
+        ast_path = temp_dir / f"File{i}.json"
+        ast_path.write_text(json.dumps(ast_data))
+        ast_paths.append(ast_path)
+    
+    return ast_paths
+
+
+def test_identifier_scanner():
+    """IdentifierScanner 사전 필터 테스트 (analyzer가 합성한 이름 포함)"""
+    print("\n" + "=" * 70)
+    print("🧪 IdentifierScanner 테스트")
+    print("=" * 70)
+    
+    from main import IdentifierScanner
+    
+    with tempfile.TemporaryDirectory() as temp_name:
+        swift_file = Path(temp_name) / "Cell.swift"
+        swift_file.write_text("""
+class Cell: UITableViewCell {
+    required init?(coder: NSCoder) {
+        super.init(coder: coder)
+    }
+    
+    subscript(i: Int) -> Int {
+        return i
+    }
+}
+""")
+        
+        cases = [
+            (['Cell'], True),
+            (['nonExistent'], False),
+            ([], False),
+            # analyzer 이름: "init\(signature)" ('?' 없음), "subscript" + params + returnClause
+            (['init(coder: NSCoder)'], True),
+            (['subscript(i: Int)-> Int'], True),
+            (['Box<T>'], False),
+            (['nonExistent', 'Cell<T>'], True),
+        ]
+        
+        for identifiers, expected in cases:
+            actual = IdentifierScanner(identifiers).mentions_any(swift_file)
+            print(f"  - {identifiers}: {actual}")
+            
+            if actual != expected:
+                print(f"❌ 결과 불일치: {identifiers} (기대값 {expected})")
+                return False
+    
+    print("✅ IdentifierScanner 검증 통과!")
+    return True
+
+
+# --batch 모드를 흉내 내는 analyzer 스텁 (stdin 경로마다 NDJSON 한 줄)
+_BATCH_ANALYZER_STUB = """\
+import json, sys
+if sys.argv[1:] != ['--batch']:
+    sys.exit(1)
+print('Analyzing...', flush=True)
+for line in sys.stdin:
+    path = line.rstrip('\\n')
+    output = {'decisions': {'classes': [{'symbol_name': path.rsplit('/', 1)[-1][:-6]}]}}
+    print(json.dumps({'file': path, 'output': output}), flush=True)
+"""
+
+# --batch를 지원하지 않는 analyzer (인자를 경로로 보고 실패)
+_REJECTING_ANALYZER_STUB = """\
+import sys
+sys.exit(1)
+"""
+
+# 응답하지 않는 analyzer
+_HANGING_ANALYZER_STUB = """\
+import time
+time.sleep(60)
+"""
+
+
+def _write_analyzer_stub(temp_dir: Path, name: str, source: str) -> Path:
+    """Python 스크립트로 된 실행 가능한 analyzer 스텁 생성"""
+    stub_path = temp_dir / name
+    stub_path.write_text(f"#!{sys.executable}\n{source}")
+    stub_path.chmod(0o755)
+    return stub_path
+
+
+def test_batch_extract_ast():
+    """batch_extract_ast 테스트 (analyzer 스텁: 정상 / --batch 미지원 / 시간 초과)"""
+    print("\n" + "=" * 70)
+    print("🧪 batch_extract_ast 테스트")
+    print("=" * 70)
+    
+    from main import batch_extract_ast
+    
+    with tempfile.TemporaryDirectory() as temp_name:
+        temp_dir = Path(temp_name)
+        swift_files = [temp_dir / f"File{i}.swift" for i in range(200)]
+        
+        # 1. 정상 NDJSON 출력 (로그 줄은 무시)
+        analyzer = _write_analyzer_stub(temp_dir, "batch_analyzer", _BATCH_ANALYZER_STUB)
+        asts = batch_extract_ast(swift_files, analyzer)
+        
+        expected = {
+            swift_file: {"symbols": [{"symbol_name": swift_file.stem}]}
+            for swift_file in swift_files
+        }
+        if asts != expected:
+            print("❌ 배치 AST 불일치")
+            return False
+        print(f"✓ 정상 출력: {len(asts)}개 파일 AST")
+        
+        # 2. --batch 미지원 → None (파일별 추출로 대체)
+        analyzer = _write_analyzer_stub(temp_dir, "old_analyzer", _REJECTING_ANALYZER_STUB)
+        if batch_extract_ast(swift_files, analyzer) is not None:
+            print("❌ --batch 미지원 analyzer는 None이어야 함")
+            return False
+        print("✓ --batch 미지원: None")
+        
+        # 3. 응답 없음 → 제한 시간 후 종료하고 None
+        analyzer = _write_analyzer_stub(temp_dir, "hanging_analyzer", _HANGING_ANALYZER_STUB)
+        start = time.perf_counter()
+        result = batch_extract_ast(swift_files[:1], analyzer, timeout_per_file=0.5)
+        elapsed = time.perf_counter() - start
+        
+        if result is not None or elapsed > 10:
+            print(f"❌ 시간 초과 처리 실패: {result!r} ({elapsed:.1f}초)")
+            return False
+        print(f"✓ 시간 초과: None ({elapsed:.1f}초)")
+    
+    print("✅ batch_extract_ast 검증 통과!")
+    return True
+
+
+def test_verify_files():
+    """StrictVerifier.verify_files 프로세스 풀 검증 테스트 (프로세스 내 호출)"""
+    print("\n" + "=" * 70)
+    print("🧪 verify_files 병렬 검증 테스트")
+    print("=" * 70)
+    
+    from config.settings import RULES_YAML
+    from verifiers import StrictVerifier
+    
+    with tempfile.TemporaryDirectory() as temp_name:
+        temp_dir = Path(temp_name)
+        
+        ast_paths = create_test_asts(temp_dir, 8)
+        llm_identifiers = ["viewDidLoad", "customMethod0", "nonExistent"]
+        
+        start = time.perf_counter()
+        results = dict(StrictVerifier.verify_files(
+            RULES_YAML, ast_paths, llm_identifiers, workers=2
+        ))
+        elapsed = time.perf_counter() - start
+        
+        print(f"✓ {len(results)}개 파일 검증 ({elapsed:.2f}초)")
+        
+        if set(results) != set(ast_paths):
+            print("❌ 결과 파일 불일치")
+            return False
+        
+        # 단일 프로세스 검증과 결과 동일
+        verifier = StrictVerifier(RULES_YAML)
+        for ast_path in ast_paths:
+            expected = verifier.verify(ast_path, llm_identifiers)
+            actual = results[ast_path]
+            
+            if [(r.identifier, r.final_decision) for r in actual] != \
+                    [(r.identifier, r.final_decision) for r in expected]:
+                print(f"❌ 결과 불일치: {ast_path.name}")
+                return False
+        
+        print("✅ verify_files 검증 통과!")
+        return True
+
+
 def test_parallel_processing():
     """병렬 처리 통합 테스트"""
     print("\n" + "=" * 70)
     print("🧪 병렬 처리 통합 테스트")
     print("=" * 70)
     
-    # 1. 테스트 프로젝트 생성
+    # 1. 테스트 프로젝트 생성 (with를 벗어나면 디렉터리째 삭제)
     print("\n📁 테스트 프로젝트 생성 중...")
-    temp_project = create_test_project()
-    print(f"✓ 생성: {temp_project}")
+    with tempfile.TemporaryDirectory() as temp_name:
+        temp_project = create_test_project(Path(temp_name))
+        print(f"✓ 생성: {temp_project}")
+        
+        return _check_parallel_processing(temp_project)
+
+
+def _check_parallel_processing(temp_project: Path) -> bool:
+    """임시 프로젝트에 대해 main.run 실행 후 결과 확인"""
+    # Swift 파일 확인 (리스트로 모으지 않고 찾는 대로 출력)
+    from main import _iter_swift
     
-    # Swift 파일 확인
-    swift_files = list(temp_project.rglob("*.swift"))
-    print(f"✓ Swift 파일: {len(swift_files)}개")
-    for f in swift_files:
+    swift_count = 0
+    for f in _iter_swift(temp_project):
         print(f"  - {f.name}")
+        swift_count += 1
+    print(f"✓ Swift 파일: {swift_count}개")
     
     # 2. 테스트 예측 생성
     print("\n📝 LLM 예측 생성 중...")
@@ -111,51 +315,32 @@ def test_parallel_processing():
     
     print(f"✓ 발견: {analyzer_path}")
     
-    # 4. main.py 실행
+    # 4. main.run 실행 (프로세스 내 호출: 인터프리터 기동/모듈 임포트 비용 제외)
     print("\n🚀 병렬 처리 실행 중...")
-    import subprocess
+    from main import run
     
-    result_file = temp_project / "result.json"
-    
-    cmd = [
-        "python", "main.py",
-        "--project", str(temp_project),
-        "--identifiers", str(pred_file),
-        "--output", str(result_file),
-        "--workers", "2"
-    ]
-    
-    print(f"실행: {' '.join(cmd)}")
+    result_file = temp_project / "result.ndjson"
     
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=60
+        verification = run(
+            project=temp_project,
+            identifiers=pred_file,
+            output=result_file,
+            workers=2,
+            analyzer=analyzer_path
         )
         
-        print("\n" + "=" * 70)
-        print("📊 실행 결과:")
-        print("=" * 70)
-        print(result.stdout)
-        
-        if result.returncode != 0:
-            print("\n❌ 실행 실패:")
-            print(result.stderr)
+        if verification is None:
+            print("\n❌ 실행 실패")
             return False
         
-        # 5. 결과 검증
+        # 5. 결과 검증 (반환된 통계 사용)
         print("\n🔍 결과 검증 중...")
         
-        if not result_file.exists():
-            print(f"❌ 결과 파일 없음: {result_file}")
-            return False
-        
-        with open(result_file, 'r') as f:
-            verification = json.load(f)
+        # NDJSON: 헤더 / 파일별 결과 / 통계 푸터
+        with open(result_file, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()][1:-1]
         
-        print(f"✓ 결과 파일 로드 완료")
         print(f"\n📈 검증 통계:")
         print(f"  - 총 파일: {verification['total_files']}")
         print(f"  - 성공: {verification['success_files']}")
@@ -169,20 +354,16 @@ def test_parallel_processing():
             print(f"\n❌ 파일 수 불일치: {verification['total_files']} != {expected_files}")
             return False
         
+        if len(records) != expected_files:
+            print(f"\n❌ 결과 줄 수 불일치: {len(records)} != {expected_files}")
+            return False
+        
         print("\n✅ 모든 검증 통과!")
         return True
         
-    except subprocess.TimeoutExpired:
-        print("\n❌ 타임아웃")
-        return False
     except Exception as e:
         print(f"\n❌ 에러: {e}")
         return False
-    finally:
-        # 7. 정리
-        print(f"\n🧹 임시 파일 정리 중...")
-        shutil.rmtree(temp_project)
-        print(f"✓ 삭제: {temp_project}")
 
 
 if __name__ == "__main__":
@@ -190,7 +371,10 @@ if __name__ == "__main__":
     print("🧪 ai_rule 통합 테스트")
     print("=" * 70)
     
-    success = test_parallel_processing()
+    success = test_identifier_scanner()
+    success = test_batch_extract_ast() and success
+    success = test_verify_files() and success
+    success = test_parallel_processing() and success
     
     print("\n" + "=" * 70)
     if success:
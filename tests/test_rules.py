@@ -4,14 +4,68 @@ test_rules.py
 Rule Engine 테스트
 """
 
+import atexit
 import sys
+import tempfile
 from pathlib import Path
 
+import yaml
+
 # 프로젝트 루트를 path에 추가
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from core.condition_matcher import ConditionMatcher
 from core.rule_engine import RuleEngine
+from core.symbol import Symbol
+
+# libyaml이 있으면 C 덤퍼 사용
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+
+
+def _write_rules_yaml(rules: dict) -> Path:
+    """테스트 Rule을 임시 YAML 파일로 저장"""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+        yaml.dump(rules, f, Dumper=_YamlDumper, sort_keys=False)
+        return Path(f.name)
+
+
+def _remove_rules_yaml(yaml_path: Path):
+    """임시 YAML 파일과 컴파일 캐시(내용 해시 캐시) 삭제"""
+    if yaml_path.exists():
+        RuleEngine.content_cache_path(yaml_path).unlink(missing_ok=True)
+        yaml_path.unlink()
+
+
+# 여러 테스트가 공유하는 Rule YAML (모듈 로드 시 한 번만 생성, 종료 시 삭제)
+_TEST_RULES = {
+    'rules': [
+        {
+            'id': 'TEST_OBJC_ATTRIBUTE',
+            'description': 'Test @objc attribute',
+            'pattern': [
+                {'find': {'target': 'S'}},
+                {'where': ["S.attributes contains_any ['@objc']"]}
+            ]
+        },
+        {
+            'id': 'TEST_LIFECYCLE_METHOD',
+            'description': 'Test lifecycle method',
+            'pattern': [
+                {'find': {'target': 'M'}},
+                {'where': [
+                    "M.name in ['viewDidLoad', 'viewWillAppear']",
+                    "M.typeInheritanceChain contains_any ['UIViewController']"
+                ]}
+            ]
+        }
+    ]
+}
+
+_RULES_YAML_PATH = _write_rules_yaml(_TEST_RULES)
+atexit.register(_remove_rules_yaml, _RULES_YAML_PATH)
 
 
 def test_condition_matcher():
@@ -54,82 +108,215 @@ def test_condition_matcher():
     print("\n✅ Condition Matcher 테스트 통과!\n")
 
 
+def test_condition_compile():
+    """컴파일된 조건식 테스트 (evaluate와 동일한 결과)"""
+    print("\n=== Condition Compile 테스트 ===\n")
+    
+    symbol = {
+        'symbol_name': 'viewDidLoad',
+        'symbol_kind': 'method',
+        'attributes': ['@objc', 'override'],
+        'inherits': ['UIViewController', 'UIResponder'],
+        'modifiers': ['override'],
+        '_hidden': 'a'
+    }
+    
+    conditions = [
+        ("S.attributes contains_any ['@objc', '@objcMembers']", True),
+        ("S.attributes contains_any ['@IBAction']", False),
+        ("M.name in ['viewDidLoad', 'viewWillAppear']", True),
+        ("M.kind == 'method'", True),
+        ("M.kind != 'method'", False),
+        ("S.isReferencedByExternalFile == true", False),
+        ("S._hidden == 'a'", True),  # 밑줄로 시작하는 필드도 AST 값 조회
+        ("M.name matches '^view.*'", False),  # 지원하지 않는 연산자
+    ]
+    
+    for condition, expected in conditions:
+        predicate = ConditionMatcher.compile(condition)
+        result = predicate(Symbol.from_dict(symbol))
+        print(f"  - {condition}: {result}")
+        assert result == expected, f"Expected {expected}"
+        assert result == ConditionMatcher.evaluate(condition, symbol), "evaluate()와 불일치"
+    
+    # 우변 리터럴은 intern된 문자열
+    predicate = ConditionMatcher.compile("S.attributes contains_any ['@objc']")
+    field_name, values = predicate.args
+    assert field_name is sys.intern('attributes'), "필드명이 intern되지 않음"
+    assert all(v is sys.intern(v) for v in values), "리터럴이 intern되지 않음"
+    
+    print("\n✅ Condition Compile 테스트 통과!\n")
+
+
 def test_rule_engine():
     """Rule Engine 테스트"""
     print("\n=== Rule Engine 테스트 ===\n")
     
-    # 간단한 Rule YAML 생성
-    import yaml
-    import tempfile
+    # Rule Engine 초기화 (모듈 공용 Rule YAML)
+    engine = RuleEngine(_RULES_YAML_PATH)
+    
+    # 테스트 심볼 1: @objc 메서드
+    symbol1 = {
+        'symbol_name': 'viewDidLoad',
+        'symbol_kind': 'method',
+        'attributes': ['@objc', 'override'],
+        'inherits': ['UIViewController'],
+        'modifiers': ['override']
+    }
+    
+    matches1 = engine.match_symbol(symbol1)
+    print(f"Symbol 1 매칭: {len(matches1)}개 Rule")
+    for match in matches1:
+        print(f"  - {match.rule_id}: {match.matched}")
+    
+    assert len(matches1) == 2, "Expected 2 rule matches"
+    
+    # 테스트 심볼 2: 일반 메서드 (Rule 미매칭)
+    symbol2 = {
+        'symbol_name': 'customMethod',
+        'symbol_kind': 'method',
+        'attributes': [],
+        'inherits': [],
+        'modifiers': []
+    }
+    
+    matches2 = engine.match_symbol(symbol2)
+    print(f"\nSymbol 2 매칭: {len(matches2)}개 Rule")
+    
+    assert len(matches2) == 0, "Expected 0 rule matches"
+    
+    print("\n✅ Rule Engine 테스트 통과!\n")
+
+
+def test_rule_cache():
+    """컴파일된 Rule 캐시 테스트"""
+    print("\n=== Rule Cache 테스트 ===\n")
     
     test_rules = {
         'rules': [
             {
-                'id': 'TEST_OBJC_ATTRIBUTE',
-                'description': 'Test @objc attribute',
+                'id': 'TEST_OBJC',
+                'description': 'Test',
                 'pattern': [
-                    {'find': {'target': 'S'}},
+                    {'find': {'target': 'M'}},
                     {'where': ["S.attributes contains_any ['@objc']"]}
                 ]
+            }
+        ]
+    }
+    
+    temp_yaml_path = _write_rules_yaml(test_rules)
+    cache_path = RuleEngine.content_cache_path(temp_yaml_path)
+    
+    try:
+        # 첫 로드: YAML 파싱 후 사용자 캐시 디렉토리에 캐시 생성
+        cache_path.unlink(missing_ok=True)
+        engine1 = RuleEngine(temp_yaml_path)
+        assert cache_path.exists(), "Expected cache file"
+        assert not temp_yaml_path.with_suffix('.rules.pkl').exists(), "YAML 옆에 캐시를 만들면 안 됨"
+        
+        # 두 번째 로드: 캐시 사용 (from_yaml도 같은 캐시)
+        engine2 = RuleEngine(temp_yaml_path)
+        engine3 = RuleEngine.from_yaml(temp_yaml_path)
+        
+        symbol = {'symbol_name': 'foo', 'symbol_kind': 'method', 'attributes': ['@objc']}
+        ids1 = [m.rule_id for m in engine1.match_symbol(symbol)]
+        ids2 = [m.rule_id for m in engine2.match_symbol(symbol)]
+        ids3 = [m.rule_id for m in engine3.match_symbol(symbol)]
+        print(f"원본: {ids1}, 캐시: {ids2}, from_yaml: {ids3}")
+        
+        assert ids1 == ids2 == ids3 == ['TEST_OBJC'], "Expected identical matches"
+        
+        # 캐시에서 읽은 Rule도 필드명/리터럴이 intern됨
+        field_name, values = engine2.rules[0]['_predicates'][0].args
+        assert field_name is sys.intern('attributes'), "캐시 로드 후 필드명이 intern되지 않음"
+        assert all(v is sys.intern(v) for v in values), "캐시 로드 후 리터럴이 intern되지 않음"
+        
+        # 캐시된 트리거 인덱스도 그대로 쓰이며 키가 intern됨
+        _, _, triggers = engine2._index_by_kind['method']
+        assert all(
+            field is sys.intern(field) and all(k is sys.intern(k) for k in postings)
+            for field, postings in triggers
+        ), "캐시 로드 후 인덱스 키가 intern되지 않음"
+        
+        print("\n✅ Rule Cache 테스트 통과!\n")
+    
+    finally:
+        _remove_rules_yaml(temp_yaml_path)
+
+
+def test_trigger_index():
+    """트리거 인덱스 테스트 (전체 순회와 결과/순서 동일)"""
+    print("\n=== Trigger Index 테스트 ===\n")
+    
+    test_rules = {
+        'rules': [
+            {
+                'id': 'NOT_PRIVATE',
+                'pattern': [
+                    {'find': {'target': 'M'}},
+                    {'where': ["M.accessLevel != 'private'"]}
+                ]
             },
             {
-                'id': 'TEST_LIFECYCLE_METHOD',
-                'description': 'Test lifecycle method',
+                'id': 'OBJC_LIFECYCLE',
                 'pattern': [
                     {'find': {'target': 'M'}},
                     {'where': [
-                        "M.name in ['viewDidLoad', 'viewWillAppear']",
-                        "M.typeInheritanceChain contains_any ['UIViewController']"
+                        "M.kind == 'method'",
+                        "M.attributes contains_any ['@objc']",
+                        "M.name in ['viewDidLoad', 'viewWillAppear']"
                     ]}
                 ]
+            },
+            {
+                'id': 'ANY_OBJC',
+                'pattern': [
+                    {'find': {'target': 'S'}},
+                    {'where': ["S.attributes contains_any ['@objc', '@IBAction']"]}
+                ]
             }
         ]
     }
     
-    # 임시 YAML 파일
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-        yaml.dump(test_rules, f)
-        temp_yaml_path = Path(f.name)
+    temp_yaml_path = _write_rules_yaml(test_rules)
     
     try:
-        # Rule Engine 초기화
         engine = RuleEngine(temp_yaml_path)
         
-        # 테스트 심볼 1: @objc 메서드
-        symbol1 = {
-            'symbol_name': 'viewDidLoad',
-            'symbol_kind': 'method',
-            'attributes': ['@objc', 'override'],
-            'inherits': ['UIViewController'],
-            'modifiers': ['override']
-        }
-        
-        matches1 = engine.match_symbol(symbol1)
-        print(f"Symbol 1 매칭: {len(matches1)}개 Rule")
-        for match in matches1:
-            print(f"  - {match.rule_id}: {match.matched}")
-        
-        assert len(matches1) == 2, "Expected 2 rule matches"
-        
-        # 테스트 심볼 2: 일반 메서드 (Rule 미매칭)
-        symbol2 = {
-            'symbol_name': 'customMethod',
-            'symbol_kind': 'method',
-            'attributes': [],
-            'inherits': [],
-            'modifiers': []
-        }
-        
-        matches2 = engine.match_symbol(symbol2)
-        print(f"\nSymbol 2 매칭: {len(matches2)}개 Rule")
-        
-        assert len(matches2) == 0, "Expected 0 rule matches"
+        cases = [
+            ({'symbol_name': 'viewDidLoad', 'symbol_kind': 'method', 'attributes': ['@objc']},
+             ['NOT_PRIVATE', 'OBJC_LIFECYCLE', 'ANY_OBJC']),
+            ({'symbol_name': 'viewDidLoad', 'symbol_kind': 'method', 'attributes': [],
+              'access_level': 'private'}, []),
+            ({'symbol_name': 'tap', 'symbol_kind': 'property', 'attributes': ['@IBAction', {}]},
+             ['ANY_OBJC']),
+            ({'symbol_name': ['viewDidLoad'], 'symbol_kind': 'method', 'attributes': '@objc'},
+             ['NOT_PRIVATE', 'ANY_OBJC']),
+        ]
         
-        print("\n✅ Rule Engine 테스트 통과!\n")
+        for symbol, expected in cases:
+            actual = [m.rule_id for m in engine.match_symbol(symbol)]
+            
+            # 인덱스 없이 kind 버킷 전체를 평가한 결과
+            bucket = engine._by_kind.get(symbol['symbol_kind'], engine._universal)
+            linear = [
+                m.rule_id for rule in bucket
+                if (m := engine._evaluate_rule(rule, Symbol.from_dict(symbol)))
+            ]
+            
+            print(f"  - {symbol['symbol_name']}: {actual}")
+            assert actual == linear == expected, f"Expected {expected}, got {actual} / {linear}"
+            
+            # 첫 매칭에서 멈추는 any_match는 match_symbol의 첫 결과와 동일
+            first = engine.any_match(symbol)
+            assert (first.rule_id if first else None) == (expected[0] if expected else None), \
+                f"any_match: {first}"
         
+        print("\n✅ Trigger Index 테스트 통과!\n")
+    
     finally:
-        # 임시 파일 삭제
-        temp_yaml_path.unlink()
+        _remove_rules_yaml(temp_yaml_path)
 
 
 def test_verifier():
@@ -137,70 +324,164 @@ def test_verifier():
     print("\n=== Verifier 테스트 ===\n")
     
     from verifiers import StrictVerifier
-    import yaml
-    import tempfile
     
-    # 테스트 Rule
-    test_rules = {
-        'rules': [
+    # Verifier 초기화
+    verifier = StrictVerifier(_RULES_YAML_PATH)
+    
+    # 테스트 AST
+    ast_data = {
+        'symbols': [
             {
-                'id': 'TEST_OBJC',
-                'description': 'Test',
-                'pattern': [
-                    {'find': {'target': 'S'}},
-                    {'where': ["S.attributes contains_any ['@objc']"]}
-                ]
+                'symbol_name': 'viewDidLoad',
+                'symbol_kind': 'method',
+                'attributes': ['@objc'],
+                'inherits': ['UIViewController']
+            },
+            {
+                'symbol_name': 'customMethod',
+                'symbol_kind': 'method',
+                'attributes': [],
+                'inherits': []
             }
         ]
     }
     
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-        yaml.dump(test_rules, f)
-        temp_yaml_path = Path(f.name)
+    # LLM 예측
+    llm_identifiers = ['viewDidLoad', 'customMethod', 'nonExistent']
+    
+    # 검증
+    results = verifier.verify(ast_data, llm_identifiers)
+    
+    print(f"검증 결과: {len(results)}개")
+    for r in results:
+        print(f"  - {r.identifier}: AST={r.found_in_ast}, Rule={len(r.rule_matches)>0}, Decision={r.final_decision}")
+    
+    # 최종 제외
+    exclusions = verifier.get_final_exclusions(results)
+    print(f"\n최종 제외: {exclusions}")
+    
+    assert len(exclusions) == 1, "Expected 1 exclusion"
+    assert 'viewDidLoad' in exclusions, "Expected viewDidLoad"
+    
+    # fast=False (매칭 Rule 전체 탐색)도 제외 결과는 동일
+    full_results = verifier.verify(ast_data, llm_identifiers, fast=False)
+    assert verifier.get_final_exclusions(full_results) == exclusions, "fast=False 결과 불일치"
+    
+    print("\n✅ Verifier 테스트 통과!\n")
+
+
+def test_report_ndjson():
+    """NDJSON 리포트 테스트 (generate_report와 같은 summary/details)"""
+    print("\n=== NDJSON 리포트 테스트 ===\n")
+    
+    from verifiers import StrictVerifier
+    import json
+    
+    verifier = StrictVerifier(_RULES_YAML_PATH)
+    
+    ast_data = {
+        'symbols': [
+            {'symbol_name': 'viewDidLoad', 'symbol_kind': 'method', 'attributes': ['@objc']},
+            {'symbol_name': 'customMethod', 'symbol_kind': 'method', 'attributes': []}
+        ]
+    }
+    results = verifier.verify(ast_data, ['viewDidLoad', 'customMethod', 'nonExistent'])
+    report = verifier.generate_report(results)
+    
+    with tempfile.NamedTemporaryFile(suffix='.ndjson', delete=False) as f:
+        report_path = Path(f.name)
     
     try:
-        # Verifier 초기화
-        verifier = StrictVerifier(temp_yaml_path)
+        summary = verifier.generate_report_ndjson(results, report_path)
+        lines = report_path.read_text(encoding='utf-8').splitlines()
         
-        # 테스트 AST
-        ast_data = {
-            'symbols': [
-                {
-                    'symbol_name': 'viewDidLoad',
-                    'symbol_kind': 'method',
-                    'attributes': ['@objc'],
-                    'inherits': ['UIViewController']
-                },
-                {
-                    'symbol_name': 'customMethod',
-                    'symbol_kind': 'method',
-                    'attributes': [],
-                    'inherits': []
-                }
-            ]
-        }
+        print(f"줄 수: {len(lines)}")
+        assert summary == report['summary'], "summary 불일치"
+        assert json.loads(lines[0]) == {'summary': report['summary']}, "첫 줄은 summary"
+        assert [json.loads(line) for line in lines[1:]] == report['details'], "details 불일치"
+        
+        print("\n✅ NDJSON 리포트 테스트 통과!\n")
+        
+    finally:
+        report_path.unlink()
+
+
+def test_verify_from_path():
+    """AST 파일 스트리밍 검증 테스트 (dict 검증과 결과 동일)"""
+    print("\n=== Verifier 스트리밍 테스트 ===\n")
+    
+    from verifiers import StrictVerifier
+    import json
+    
+    ast_data = {
+        'file': 'Test.swift',
+        'symbols': [
+            {
+                'symbol_name': 'viewDidLoad',
+                'symbol_kind': 'method',
+                'attributes': ['@objc'],
+                'line': 3,
+                'parent': {'name': 'MyViewController', 'kind': 'class'}
+            },
+            {
+                'symbol_name': 'customMethod',
+                'symbol_kind': 'method',
+                'attributes': []
+            }
+        ],
+        'classes': [
+            {
+                'symbol_name': 'MyViewController',
+                'symbol_kind': 'class',
+                'attributes': ['@objc']
+            }
+        ]
+    }
+    
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+        json.dump(ast_data, f)
+        temp_ast_path = Path(f.name)
+    
+    try:
+        verifier = StrictVerifier(_RULES_YAML_PATH)
+        llm_identifiers = ['MyViewController', 'viewDidLoad', 'customMethod', 'nonExistent']
         
-        # LLM 예측
-        llm_identifiers = ['viewDidLoad', 'customMethod', 'nonExistent']
+        expected = verifier.verify(ast_data, llm_identifiers)
+        streamed = verifier.verify_from_path(temp_ast_path, llm_identifiers)
+        dispatched = verifier.verify(temp_ast_path, llm_identifiers)
         
-        # 검증
-        results = verifier.verify(ast_data, llm_identifiers)
+        for results in (streamed, dispatched):
+            assert [r.identifier for r in results] == [r.identifier for r in expected]
+            assert [r.final_decision for r in results] == [r.final_decision for r in expected]
+            assert [r.ast_symbol for r in results] == [r.ast_symbol for r in expected]
         
-        print(f"검증 결과: {len(results)}개")
-        for r in results:
-            print(f"  - {r.identifier}: AST={r.found_in_ast}, Rule={len(r.rule_matches)>0}, Decision={r.final_decision}")
+        exclusions = verifier.get_final_exclusions(streamed)
+        print(f"최종 제외: {exclusions}")
+        assert exclusions == ['MyViewController', 'viewDidLoad']
         
-        # 최종 제외
-        exclusions = verifier.get_final_exclusions(results)
-        print(f"\n최종 제외: {exclusions}")
+        # 같은 이름이 여러 키에 있으면 두 경로 모두 문서 순서상 먼저 나온 심볼 사용
+        duplicate_ast = {
+            'classes': [
+                {'symbol_name': 'AppDelegate', 'symbol_kind': 'class', 'attributes': ['@objc']}
+            ],
+            'symbols': [
+                {'symbol_name': 'AppDelegate', 'symbol_kind': 'struct', 'attributes': []}
+            ]
+        }
+        temp_ast_path.write_text(json.dumps(duplicate_ast), encoding='utf-8')
         
-        assert len(exclusions) == 1, "Expected 1 exclusion"
-        assert 'viewDidLoad' in exclusions, "Expected viewDidLoad"
+        expected = verifier.verify(duplicate_ast, ['AppDelegate'], fast=False)
+        streamed = verifier.verify_from_path(temp_ast_path, ['AppDelegate'], fast=False)
         
-        print("\n✅ Verifier 테스트 통과!\n")
+        assert expected[0].ast_symbol['symbol_kind'] == 'class', "먼저 나온 class 심볼 사용"
+        assert streamed[0].ast_symbol == expected[0].ast_symbol
+        assert [m.rule_id for m in streamed[0].rule_matches] == \
+            [m.rule_id for m in expected[0].rule_matches] == ['TEST_OBJC_ATTRIBUTE']
         
+        print("\n✅ Verifier 스트리밍 테스트 통과!\n")
+    
     finally:
-        temp_yaml_path.unlink()
+        temp_ast_path.unlink()
 
 
 if __name__ == "__main__":
@@ -209,8 +490,13 @@ if __name__ == "__main__":
     print("=" * 60)
     
     test_condition_matcher()
+    test_condition_compile()
     test_rule_engine()
+    test_rule_cache()
+    test_trigger_index()
     test_verifier()
+    test_report_ndjson()
+    test_verify_from_path()
     
     print("=" * 60)
     print("✅ 모든 테스트 통과!")
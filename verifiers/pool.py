@@ -0,0 +1,89 @@
+"""
+pool.py
+
+검증용 프로세스 풀 (워커당 StrictVerifier 하나를 프로세스 수명 동안 재사용)
+
+Rule YAML 로드/컴파일은 작업마다가 아니라 워커당 한 번만 수행하고,
+이후 작업은 match_symbol 비용만 낸다.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Collection, Dict, List, Optional, Tuple
+
+from .strict_verifier import StrictVerifier, VerificationResult
+
+
+# 워커 프로세스별 상태 (fork 시 부모에서 상속, 아니면 _init_worker에서 생성)
+# - 'verifier': StrictVerifier
+# - 'identifiers': 모든 작업에 공통인 LLM 예측 식별자 (create_pool에 준 경우)
+_STATE: Dict[str, Any] = {}
+
+
+def _init_worker(rules_yaml_path: Path, llm_identifiers: Optional[Collection[str]]):
+    """워커 프로세스 초기화: Rule 로드/컴파일과 식별자 전달을 워커당 한 번만 수행"""
+    _STATE['verifier'] = StrictVerifier(Path(rules_yaml_path))
+    _STATE['identifiers'] = llm_identifiers
+
+
+def run_task(
+    task: Tuple[Path, float, bool]
+) -> Tuple[Path, List[VerificationResult]]:
+    """
+    워커에서 AST 파일 하나 검증 (pickle 가능하도록 모듈 함수)
+    
+    식별자는 작업마다 보내지 않고 create_pool에 준 것을 사용한다.
+    
+    Args:
+        task: (AST 파일 경로, 최소 신뢰도, fast)
+    
+    Returns:
+        (AST 파일 경로, 검증 결과 리스트)
+    """
+    ast_path, min_confidence, fast = task
+    verifier = _STATE['verifier']
+    return ast_path, verifier.verify_from_path(ast_path, _STATE['identifiers'], min_confidence, fast)
+
+
+def worker_verifier() -> StrictVerifier:
+    """현재 프로세스의 워커 Verifier (create_pool로 만든 풀의 작업 안에서 호출)"""
+    return _STATE['verifier']
+
+
+def create_pool(
+    workers: Optional[int],
+    rules_yaml_path: Path,
+    verifier: Optional[StrictVerifier] = None,
+    llm_identifiers: Optional[Collection[str]] = None
+) -> ProcessPoolExecutor:
+    """
+    검증용 프로세스 풀 생성
+    
+    verifier를 주고 fork를 지원하면 부모의 Verifier를 그대로 fork하여
+    워커가 copy-on-write로 공유한다 (pickle/재컴파일 없음).
+    그 외에는 initializer로 워커마다 한 번 생성한다 (Rule 캐시 덕분에 저렴).
+    llm_identifiers도 같은 경로로 워커당 한 번만 전달되어 run_task에서 쓰인다.
+    
+    Args:
+        workers: 워커 수 (None이면 CPU 수)
+        rules_yaml_path: Rule YAML 경로 (워커에서 생성할 때 사용)
+        verifier: 부모 프로세스에서 이미 만든 Verifier (선택)
+        llm_identifiers: 모든 작업에 공통인 LLM 예측 식별자 (선택, run_task용)
+    
+    Returns:
+        ProcessPoolExecutor (작업에서 worker_verifier()로 Verifier 사용)
+    """
+    if verifier is not None and 'fork' in multiprocessing.get_all_start_methods():
+        _STATE['verifier'] = verifier
+        _STATE['identifiers'] = llm_identifiers
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('fork')
+        )
+    
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(rules_yaml_path, llm_identifiers)
+    )
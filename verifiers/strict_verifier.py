@@ -5,14 +5,34 @@ LLM 예측 식별자를 AST + 엄격한 Rule로 검증
 """
 
 import json
+from concurrent.futures import as_completed
+from itertools import chain
 from pathlib import Path
-from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from typing import Collection, Iterator, List, Dict, Optional, Set, Tuple, Union
+from dataclasses import dataclass
 
+from core._intern import intern_symbol
 from core.rule_engine import RuleEngine, RuleMatch
 
+try:
+    import ijson
+except ImportError:  # 선택 의존성: 없으면 json.load 후 전체 추출
+    ijson = None
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json 사용
+    orjson = None
+
+
+# 심볼 리스트가 들어있는 AST 최상위 키 (검색 순서는 AST 문서 순서)
+_SYMBOL_KEYS = frozenset(['symbols', 'classes', 'structs', 'methods', 'properties', 'variables'])
+
+# 스트리밍 파싱 시 심볼로 조립할 배열 원소 (AST 최상위 키.item)
+_SYMBOL_ITEM_PREFIXES = frozenset(f'{key}.item' for key in _SYMBOL_KEYS)
+
+
+@dataclass(slots=True, frozen=True)
 class VerificationResult:
     """검증 결과"""
     identifier: str
@@ -22,60 +42,227 @@ class VerificationResult:
     final_decision: bool  # True: 제외, False: 제외하지 않음
     confidence: float
     reasoning: str
+    
+    def to_dict(self) -> Dict:
+        """리포트용 dict (ast_symbol 제외, asdict의 재귀 복사 없음)"""
+        matched_rules = [m.rule_id for m in self.rule_matches]
+        return {
+            "identifier": self.identifier,
+            "found_in_ast": self.found_in_ast,
+            "rule_matched": bool(matched_rules),
+            "matched_rules": matched_rules,
+            "final_decision": self.final_decision,
+            "confidence": self.confidence,
+            "reasoning": self.reasoning
+        }
+
+
+def ndjson_line(obj) -> bytes:
+    """NDJSON 한 줄 직렬화 (orjson 우선, 줄바꿈 포함)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(obj, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def _dumps_indented(obj, newline: bytes) -> bytes:
+    """orjson 들여쓰기 2 직렬화 후 줄바꿈마다 바깥 들여쓰기 추가"""
+    data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    # JSON 문자열 안의 줄바꿈은 \n으로 이스케이프되므로 실제 개행만 치환됨
+    return data.replace(b'\n', newline)
+
+
+def _write_report(report: Dict, output_path: Path):
+    """
+    리포트 JSON 저장 (json.dump(indent=2)와 같은 형식)
+    
+    orjson이 있으면 details는 한 건씩 직렬화하여 바로 기록하므로
+    리포트 전체를 하나의 문자열로 만들지 않는다.
+    """
+    if orjson is None:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return
+    
+    last_key = next(reversed(report), None)
+    
+    with open(output_path, 'wb') as f:
+        f.write(b'{\n')
+        
+        for key, value in report.items():
+            f.write(b'  ' + orjson.dumps(key) + b': ')
+            
+            if key == 'details' and value:
+                f.write(b'[\n')
+                last = len(value) - 1
+                for i, row in enumerate(value):
+                    f.write(b'    ' + _dumps_indented(row, b'\n    '))
+                    f.write(b',\n' if i < last else b'\n')
+                f.write(b'  ]')
+            else:
+                f.write(_dumps_indented(value, b'\n  '))
+            
+            f.write(b'\n' if key == last_key else b',\n')
+        
+        f.write(b'}')
 
 
 class StrictVerifier:
     """엄격한 LLM 예측 검증기"""
     
     def __init__(self, rules_yaml_path: Path):
+        # 내용 해시 캐시 사용: 워커마다 YAML을 다시 파싱하지 않음
         self.rule_engine = RuleEngine(rules_yaml_path)
     
+    @classmethod
+    def verify_files(
+        cls,
+        rules_yaml_path: Path,
+        ast_paths: Collection[Path],
+        llm_identifiers: Collection[str],
+        workers: Optional[int] = None,
+        min_confidence: float = 1.0,
+        fast: bool = True
+    ) -> Iterator[Tuple[Path, List[VerificationResult]]]:
+        """
+        여러 AST JSON 파일을 프로세스 풀에서 병렬 검증
+        
+        워커마다 Verifier를 한 번만 만들고 파일을 작업 단위로 나눠 준다.
+        결과는 끝나는 순서대로 내보내므로 호출 측에서 바로 집계할 수 있다.
+        
+        Args:
+            rules_yaml_path: Rule YAML 경로
+            ast_paths: AST JSON 파일 경로들
+            llm_identifiers: LLM이 예측한 식별자 (모든 파일 공통)
+            workers: 워커 수 (None이면 CPU 수)
+            min_confidence: 최소 신뢰도
+            fast: 첫 매칭 Rule만 찾기 (verify 참고)
+        
+        Yields:
+            (AST 파일 경로, 검증 결과 리스트) - 완료 순서
+        """
+        from .pool import create_pool, run_task  # pool이 이 모듈을 import하므로 지연 import
+        
+        # 식별자는 initializer로 워커당 한 번만 전달 (작업마다 pickle하지 않음)
+        identifiers = sorted(llm_identifiers)
+        
+        with create_pool(workers, rules_yaml_path, llm_identifiers=identifiers) as executor:
+            futures = [
+                executor.submit(run_task, (Path(ast_path), min_confidence, fast))
+                for ast_path in ast_paths
+            ]
+            
+            for future in as_completed(futures):
+                yield future.result()
+    
     def verify(
         self,
-        ast_data: Dict,
-        llm_identifiers: List[str],
-        min_confidence: float = 1.0  # 엄격: Rule 매칭 필수
+        ast_data: Union[Dict, Path],
+        llm_identifiers: Collection[str],
+        min_confidence: float = 1.0,  # 엄격: Rule 매칭 필수
+        fast: bool = True
     ) -> List[VerificationResult]:
         """
         LLM 예측 식별자를 엄격하게 검증
         
         Args:
-            ast_data: AST JSON 데이터
-            llm_identifiers: LLM이 예측한 식별자 리스트
+            ast_data: AST JSON 데이터 (Path면 verify_from_path로 스트리밍 처리)
+            llm_identifiers: LLM이 예측한 식별자 (list, set, frozenset 등)
             min_confidence: 최소 신뢰도 (기본: 1.0 - Rule 매칭 필수)
+            fast: min_confidence가 1.0 이상일 때 심볼마다 첫 매칭 Rule만 찾기
+                (제외 여부는 같고 rule_matches가 1개로 줄어듦,
+                 리포트에 매칭된 Rule을 모두 남기려면 False)
         
         Returns:
-            검증 결과 리스트
+            검증 결과 리스트 (식별자 정렬 순)
         """
-        results = []
+        if isinstance(ast_data, Path):
+            return self.verify_from_path(ast_data, llm_identifiers, min_confidence, fast)
         
-        # AST에서 심볼 추출
-        symbols = self._extract_symbols(ast_data)
+        # AST에서 예측 식별자에 해당하는 심볼만 추출
+        symbols = self._extract_symbols(ast_data, set(llm_identifiers))
         
-        for identifier in llm_identifiers:
-            # Step 1: AST에서 찾기
-            symbol = symbols.get(identifier)
-            
-            if not symbol:
-                # AST에 없음 (LLM 환각)
-                results.append(VerificationResult(
-                    identifier=identifier,
-                    found_in_ast=False,
-                    ast_symbol=None,
-                    rule_matches=[],
-                    final_decision=False,
-                    confidence=0.0,
-                    reasoning="Not found in AST (LLM hallucination)"
-                ))
-                continue
+        return self._verify_symbols(symbols, llm_identifiers, fast and min_confidence >= 1.0)
+    
+    def verify_from_path(
+        self,
+        ast_path: Path,
+        llm_identifiers: Collection[str],
+        min_confidence: float = 1.0,
+        fast: bool = True
+    ) -> List[VerificationResult]:
+        """
+        AST JSON 파일을 스트리밍으로 읽으며 검증
+        
+        파일 전체를 dict로 만들지 않고 심볼을 하나씩 조립하며,
+        예측 식별자를 모두 찾으면 나머지는 읽지 않는다.
+        
+        Args:
+            ast_path: AST JSON 파일 경로
+            llm_identifiers: LLM이 예측한 식별자
+            min_confidence: 최소 신뢰도 (기본: 1.0 - Rule 매칭 필수)
+            fast: 첫 매칭 Rule만 찾기 (verify 참고)
+        
+        Returns:
+            검증 결과 리스트 (verify와 동일한 형식/순서)
+        """
+        symbols = self._stream_symbols(Path(ast_path), set(llm_identifiers))
+        
+        return self._verify_symbols(symbols, llm_identifiers, fast and min_confidence >= 1.0)
+    
+    def _verify_symbols(
+        self,
+        symbols: Dict[str, Dict],
+        llm_identifiers: Collection[str],
+        first_match_only: bool = False
+    ) -> List[VerificationResult]:
+        """
+        추출된 심볼로 식별자별 검증 결과 생성
+        
+        AST에 있는 이름/없는 이름은 집합 연산으로 한 번에 나누고,
+        Rule 매칭은 AST에 있는 이름에 대해서만 수행한다.
+        결과는 식별자 정렬 순이므로 입력이 set/frozenset이어도 순서가 같다.
+        
+        Args:
+            symbols: {symbol_name: symbol_data} 딕셔너리
+            llm_identifiers: LLM이 예측한 식별자
+            first_match_only: True면 RuleEngine.any_match로 첫 매칭 Rule만 찾기
+        
+        Returns:
+            검증 결과 리스트 (식별자 정렬 순, 중복 식별자는 중복 그대로)
+        """
+        wanted = set(llm_identifiers)
+        present = wanted & symbols.keys()
+        
+        # AST에 없음 (LLM 환각)
+        by_identifier = {
+            identifier: VerificationResult(
+                identifier=identifier,
+                found_in_ast=False,
+                ast_symbol=None,
+                rule_matches=[],
+                final_decision=False,
+                confidence=0.0,
+                reasoning="Not found in AST (LLM hallucination)"
+            )
+            for identifier in wanted - present
+        }
+        
+        # AST에 있음 → Rule 매칭
+        rule_engine = self.rule_engine
+        
+        for identifier in sorted(present):
+            symbol = symbols[identifier]
             
-            # Step 2: Rule 매칭
-            rule_matches = self.rule_engine.match_symbol(symbol)
+            if first_match_only:
+                first = rule_engine.any_match(symbol)
+                rule_matches = [first] if first is not None else []
+            else:
+                rule_matches = rule_engine.match_symbol(symbol)
             
             if rule_matches:
                 # Rule 매칭 성공
                 matched_rules = [m.rule_id for m in rule_matches]
-                results.append(VerificationResult(
+                by_identifier[identifier] = VerificationResult(
                     identifier=identifier,
                     found_in_ast=True,
                     ast_symbol=symbol,
@@ -83,10 +270,10 @@ class StrictVerifier:
                     final_decision=True,  # 제외 확정
                     confidence=1.0,
                     reasoning=f"Matched {len(rule_matches)} strict rule(s): {', '.join(matched_rules)}"
-                ))
+                )
             else:
                 # Rule 매칭 실패
-                results.append(VerificationResult(
+                by_identifier[identifier] = VerificationResult(
                     identifier=identifier,
                     found_in_ast=True,
                     ast_symbol=symbol,
@@ -94,9 +281,9 @@ class StrictVerifier:
                     final_decision=False,  # 제외하지 않음
                     confidence=0.0,
                     reasoning="Found in AST but no rule match (insufficient evidence)"
-                ))
+                )
         
-        return results
+        return [by_identifier[identifier] for identifier in sorted(llm_identifiers)]
     
     def get_final_exclusions(
         self,
@@ -121,36 +308,97 @@ class StrictVerifier:
         
         return exclusions
     
-    def _extract_symbols(self, ast_data: Dict) -> Dict[str, Dict]:
+    def _extract_symbols(self, ast_data: Dict, wanted: Set[str]) -> Dict[str, Dict]:
         """
-        AST에서 모든 심볼 추출
+        AST에서 찾는 이름의 심볼만 추출
+        
+        symbols 키와 타입별 리스트(classes, structs, ...)를 AST 문서 순서대로
+        한 번에 순회하며, 같은 이름이 여러 번 나오면 먼저 나온 심볼을 사용한다
+        (파일을 앞에서부터 읽는 _stream_symbols와 같은 선택).
+        wanted를 모두 찾으면 나머지는 보지 않는다.
+        추출한 심볼의 매칭 필드 문자열은 intern_symbol로 intern한다.
         
         Args:
             ast_data: AST JSON 데이터
+            wanted: 찾을 심볼 이름 집합
         
         Returns:
-            {symbol_name: symbol_data} 딕셔너리
+            {symbol_name: symbol_data} 딕셔너리 (wanted에 있는 이름만)
         """
         symbols = {}
         
-        # AST 구조에 따라 심볼 추출
-        # symbols 키에 리스트가 있는 경우
-        if 'symbols' in ast_data:
-            for symbol in ast_data['symbols']:
-                name = symbol.get('symbol_name')
-                if name:
-                    symbols[name] = symbol
+        if not wanted:
+            return symbols
         
-        # 또는 타입별로 분리되어 있는 경우
-        for key in ['classes', 'structs', 'methods', 'properties', 'variables']:
-            if key in ast_data:
-                for symbol in ast_data[key]:
-                    name = symbol.get('symbol_name')
-                    if name:
-                        symbols[name] = symbol
+        lists = (value for key, value in ast_data.items() if key in _SYMBOL_KEYS)
+        
+        for symbol in chain.from_iterable(lists):
+            name = symbol.get('symbol_name')
+            if name in wanted and name not in symbols:
+                symbols[name] = intern_symbol(symbol)
+                if len(symbols) == len(wanted):
+                    break
         
         return symbols
     
+    def _stream_symbols(self, ast_path: Path, wanted: Set[str]) -> Dict[str, Dict]:
+        """
+        AST JSON 파일에서 찾는 이름의 심볼만 추출 (ijson 단일 패스)
+        
+        symbols/classes/structs/... 배열의 원소를 하나씩 조립하고,
+        같은 이름이 여러 번 나오면 먼저 나온 심볼을 사용한다.
+        ijson이 없으면 json.load 후 _extract_symbols로 대체.
+        
+        Args:
+            ast_path: AST JSON 파일 경로
+            wanted: 찾을 심볼 이름 집합
+        
+        Returns:
+            {symbol_name: symbol_data} 딕셔너리 (wanted에 있는 이름만)
+        """
+        if ijson is None:
+            with open(ast_path, 'rb') as f:
+                return self._extract_symbols(json.load(f), wanted)
+        
+        found = {}
+        remaining = set(wanted)
+        
+        if not remaining:
+            return found
+        
+        builder = None
+        item_prefix = None
+        
+        with open(ast_path, 'rb') as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if builder is None:
+                    # 심볼 배열 원소(객체) 시작
+                    if event == 'start_map' and prefix in _SYMBOL_ITEM_PREFIXES:
+                        builder = ijson.ObjectBuilder()
+                        builder.event(event, value)
+                        item_prefix = prefix
+                    continue
+                
+                builder.event(event, value)
+                
+                if event != 'end_map' or prefix != item_prefix:
+                    continue
+                
+                # 심볼 하나 완성
+                symbol = builder.value
+                builder = None
+                
+                name = symbol.get('symbol_name')
+                if name in remaining:
+                    found[name] = intern_symbol(symbol)
+                    remaining.discard(name)
+                    
+                    # 모두 찾았으면 나머지는 읽지 않음
+                    if not remaining:
+                        break
+        
+        return found
+    
     def generate_report(
         self,
         results: List[VerificationResult],
@@ -166,40 +414,92 @@ class StrictVerifier:
         Returns:
             리포트 딕셔너리
         """
-        # 통계
-        total = len(results)
-        found_in_ast = sum(1 for r in results if r.found_in_ast)
-        rule_matched = sum(1 for r in results if r.rule_matches)
-        final_exclusions = sum(1 for r in results if r.final_decision)
+        # 통계/제외 목록/상세를 한 번의 순회로 생성
+        found_in_ast = rule_matched = 0
+        exclusions = []
+        details = []
+        
+        for r in results:
+            if r.found_in_ast:
+                found_in_ast += 1
+            if r.rule_matches:
+                rule_matched += 1
+            if r.final_decision:
+                exclusions.append(r.identifier)
+            details.append(r.to_dict())
         
         # 리포트
         report = {
-            "summary": {
-                "total_llm_predictions": total,
-                "found_in_ast": found_in_ast,
-                "rule_matched": rule_matched,
-                "final_exclusions": final_exclusions,
-                "hallucination_rate": f"{((total - found_in_ast) / total * 100):.1f}%" if total > 0 else "0%",
-                "rule_match_rate": f"{(rule_matched / found_in_ast * 100):.1f}%" if found_in_ast > 0 else "0%"
-            },
-            "exclusions": [r.identifier for r in results if r.final_decision],
-            "details": [
-                {
-                    "identifier": r.identifier,
-                    "found_in_ast": r.found_in_ast,
-                    "rule_matched": len(r.rule_matches) > 0,
-                    "matched_rules": [m.rule_id for m in r.rule_matches],
-                    "final_decision": r.final_decision,
-                    "confidence": r.confidence,
-                    "reasoning": r.reasoning
-                }
-                for r in results
-            ]
+            "summary": self._summary_dict(len(results), found_in_ast, rule_matched, len(exclusions)),
+            "exclusions": exclusions,
+            "details": details
         }
         
         # 파일 저장
         if output_path:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+            _write_report(report, output_path)
         
         return report
+    
+    def generate_report_ndjson(
+        self,
+        results: List[VerificationResult],
+        output_path: Path
+    ) -> Dict:
+        """
+        검증 결과를 NDJSON 리포트로 저장 (한 줄에 JSON 객체 하나)
+        
+        첫 줄은 {"summary": ...}, 이후 결과 한 건당 한 줄 (generate_report의
+        details와 같은 형식). 결과를 한 건씩 직렬화하여 바로 기록하므로
+        리포트 전체를 메모리에 만들지 않고, 읽는 쪽도 한 줄씩 처리할 수 있다.
+        
+        Args:
+            results: 검증 결과
+            output_path: 저장 경로
+        
+        Returns:
+            summary 딕셔너리
+        """
+        summary = self._compute_summary(results)
+        
+        with open(output_path, 'wb') as f:
+            f.write(ndjson_line({"summary": summary}))
+            for result in results:
+                f.write(ndjson_line(result.to_dict()))
+        
+        return summary
+    
+    @staticmethod
+    def _compute_summary(results: List[VerificationResult]) -> Dict:
+        """
+        리포트 summary (예측 수, AST 발견 수, Rule 매칭 수, 제외 수, 비율)
+        
+        Args:
+            results: 검증 결과
+        
+        Returns:
+            summary 딕셔너리
+        """
+        found_in_ast = rule_matched = final_exclusions = 0
+        
+        for r in results:
+            if r.found_in_ast:
+                found_in_ast += 1
+            if r.rule_matches:
+                rule_matched += 1
+            if r.final_decision:
+                final_exclusions += 1
+        
+        return StrictVerifier._summary_dict(len(results), found_in_ast, rule_matched, final_exclusions)
+    
+    @staticmethod
+    def _summary_dict(total: int, found_in_ast: int, rule_matched: int, final_exclusions: int) -> Dict:
+        """집계 값 → summary 딕셔너리 (비율 문자열 포함, generate_report와 공용)"""
+        return {
+            "total_llm_predictions": total,
+            "found_in_ast": found_in_ast,
+            "rule_matched": rule_matched,
+            "final_exclusions": final_exclusions,
+            "hallucination_rate": f"{((total - found_in_ast) / total * 100):.1f}%" if total > 0 else "0%",
+            "rule_match_rate": f"{(rule_matched / found_in_ast * 100):.1f}%" if found_in_ast > 0 else "0%"
+        }